@@ -1,5 +1,12 @@
 from fastapi import APIRouter
 
+from src.api.v1.categories import router as categories_router
+from src.api.v1.health import router as health_router
+from src.api.v1.products import router as products_router
+
 router = APIRouter(prefix="/v1")
+router.include_router(categories_router)
+router.include_router(products_router)
+router.include_router(health_router)
 
 __all__ = ["router"]
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Query, Request, Response, status
+
+from src.api.v1.dependencies.db import DBDep
+from src.schemas.category import (
+    CategoryDTO,
+    CategoryProductsLoad,
+    CategorySimilarityDTO,
+    CategorySummaryDTO,
+    CategoryWithProductsDTO,
+)
+from src.services.category import CategoryService
+from src.utils.etag import is_not_modified, make_etag, validator_headers
+
+router = APIRouter(prefix="/categories", tags=["Categories"])
+
+
+@router.get("", response_model=list[CategoryWithProductsDTO | CategorySummaryDTO | CategoryDTO])
+async def get_categories(
+    db: DBDep,
+    request: Request,
+    response: Response,
+    products: CategoryProductsLoad = CategoryProductsLoad.COUNT,
+    products_limit: int = Query(10, ge=1, le=100),
+):
+    service = CategoryService(db)
+    version = await service.get_categories_version(products=products)
+    etag = make_etag("categories", products, products_limit, version.last_modified, version.version)
+    headers = validator_headers(etag, version.last_modified)
+    if is_not_modified(request.headers, etag, version.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return await service.get_categories(products=products, products_limit=products_limit, version=version.version)
+
+
+@router.get("/similar")
+async def get_similar_categories(
+    db: DBDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    threshold: float = Query(0.3, ge=0, le=1),
+) -> list[CategorySimilarityDTO]:
+    return await CategoryService(db).get_similar_categories(q, limit=limit, threshold=threshold)
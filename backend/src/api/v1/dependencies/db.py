@@ -2,12 +2,12 @@ from typing import Annotated, Any, AsyncGenerator
 
 from fastapi import Depends
 
-from src.db import sessionmaker, sessionmaker_null_pool
+from src.db import sessionmaker, sessionmaker_null_pool, sessionmaker_replica
 from src.utils.db_tools import DBManager
 
 
 async def get_db() -> AsyncGenerator[DBManager, Any]:
-    async with DBManager(session_factory=sessionmaker) as db:
+    async with DBManager(session_factory=sessionmaker, read_session_factory=sessionmaker_replica) as db:
         yield db
 
 
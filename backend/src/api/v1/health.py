@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from src.db import engine
+from src.schemas.health import PoolStatsDTO
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/pool")
+async def get_pool_stats() -> PoolStatsDTO:
+    return PoolStatsDTO.model_validate(engine.pool.stats())  # type: ignore
@@ -0,0 +1,84 @@
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from src.api.v1.dependencies.db import DBDep
+from src.db import sessionmaker, sessionmaker_replica
+from src.schemas.pagination import CursorPageDTO
+from src.schemas.product import ProductDTO, ProductListQueryDTO, ProductSearchHitDTO, ProductSimilarityDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.etag import is_not_modified, make_etag, validator_headers
+from src.utils.exceptions import InvalidPageRequestError, InvalidPageRequestHTTPError
+from src.utils.export import ExportFormat
+
+router = APIRouter(prefix="/products", tags=["Products"])
+
+
+@router.get("", response_model=CursorPageDTO[ProductDTO])
+async def get_products(
+    db: DBDep,
+    request: Request,
+    response: Response,
+    query: Annotated[ProductListQueryDTO, Query()],
+):
+    service = ProductService(db)
+    version = await service.get_products_version()
+    etag = make_etag("products", query.model_dump(), version.last_modified, version.version)
+    headers = validator_headers(etag, version.last_modified)
+    if is_not_modified(request.headers, etag, version.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    try:
+        return await service.get_products_page(
+            cursor=query.cursor,
+            limit=query.limit,
+            sort_by=query.sort_by,
+            descending=query.descending,
+            filters=query,
+        )
+    except InvalidPageRequestError as exc:
+        raise InvalidPageRequestHTTPError(detail=exc.detail) from exc
+
+
+@router.get("/search")
+async def search_products(
+    db: DBDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+) -> CursorPageDTO[ProductSearchHitDTO]:
+    try:
+        return await ProductService(db).search_products(q, cursor=cursor, limit=limit)
+    except InvalidPageRequestError as exc:
+        raise InvalidPageRequestHTTPError(detail=exc.detail) from exc
+
+
+@router.get("/similar")
+async def get_similar_products(
+    db: DBDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=100),
+    threshold: float = Query(0.3, ge=0, le=1),
+) -> list[ProductSimilarityDTO]:
+    return await ProductService(db).get_similar_products(q, limit=limit, threshold=threshold)
+
+
+async def stream_products_export(format: ExportFormat, batch_size: int) -> AsyncIterator[bytes]:
+    # the response body outlives request dependencies, so the stream owns its session
+    async with DBManager(session_factory=sessionmaker, read_session_factory=sessionmaker_replica) as db:
+        async for chunk in ProductService(db).export_products(format=format, batch_size=batch_size):
+            yield chunk
+
+
+@router.get("/export")
+async def export_products(
+    format: ExportFormat = ExportFormat.NDJSON,
+    batch_size: int = Query(1000, ge=1, le=10_000),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_products_export(format=format, batch_size=batch_size),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
@@ -0,0 +1,20 @@
+import asyncpg
+
+from src.config import settings
+from src.utils.cache import AsyncTTLCache
+from src.utils.cache_bus import InvalidationListener
+
+catalog_cache = AsyncTTLCache(maxsize=settings.cache.maxsize, ttl=settings.cache.ttl)
+
+
+async def connect_listener() -> asyncpg.Connection:
+    return await asyncpg.connect(
+        host=settings.db.host,
+        port=settings.db.port,
+        user=settings.db.user,
+        password=settings.db.password.get_secret_value(),
+        database=settings.db.name,
+    )
+
+
+cache_listener = InvalidationListener(catalog_cache, channel=settings.cache.channel, connect=connect_listener)
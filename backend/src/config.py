@@ -1,13 +1,22 @@
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Self
 
-from pydantic import BaseModel, SecretStr
+from pydantic import BaseModel, Field, SecretStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from sqlalchemy import URL
 
 BASE_DIR: Path = Path(__file__).parent.parent
 
 
+class ReplicaConfig(BaseModel):
+    host: str
+    port: int = 5432
+    # unset credentials and database name are taken from the primary
+    user: str | None = None
+    name: str | None = None
+    password: SecretStr | None = None
+
+
 class DBConfig(BaseModel):
     ### sqlalchemy
     echo: bool = False
@@ -22,6 +31,25 @@ class DBConfig(BaseModel):
         "pk": "pk_%(table_name)s",
     }
 
+    ### pool, sizes left unset are derived from the number of gunicorn workers
+    max_connections: int = 90
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_warmup: bool = True
+
+    ### reads
+    core_reads: bool = True
+    # skips coercion of values read back from the database; not faster than validation on current pydantic
+    trusted_mapping: bool = False
+    # concurrent lookups by id within the window are answered by one query; off by default, since every
+    # lookup then waits out the window and runs on a pooled session of its own even when nothing else is asking
+    batch_lookups: bool = False
+    batch_window_ms: float = 1.0
+    batch_max_size: int = 1000
+
     ### database config
     host: str
     user: str
@@ -29,6 +57,7 @@ class DBConfig(BaseModel):
     port: int
     password: SecretStr
     name_test: str = "postgres"
+    replica: ReplicaConfig | None = None
 
     @property
     def async_url(self) -> URL:
@@ -41,6 +70,19 @@ class DBConfig(BaseModel):
             password=self.password.get_secret_value(),
         )
 
+    @property
+    def replica_async_url(self) -> URL | None:
+        if self.replica is None:
+            return None
+        return URL.create(
+            drivername="postgresql+asyncpg",
+            host=self.replica.host,
+            port=self.replica.port,
+            database=self.replica.name or self.name,
+            username=self.replica.user or self.user,
+            password=(self.replica.password or self.password).get_secret_value(),
+        )
+
 
 class GunicornConfig(BaseModel):
     port: int = 8888
@@ -59,6 +101,49 @@ class UvicornConfig(BaseModel):
     reload: bool = True
 
 
+class CacheConfig(BaseModel):
+    enabled: bool = True
+    ttl: float = 60.0
+    maxsize: int = 1024
+    channel: str = "cache_invalidation"
+
+
+class StockBufferConfig(BaseModel):
+    # write-behind merging of quantity deltas for hot products, off unless asked for
+    enabled: bool = False
+    flush_interval_ms: float = 20.0
+    # a flush starts early once this many deltas are waiting
+    max_deltas: int = 500
+    # deltas accepted but not yet applied, callers beyond it wait for a slot
+    max_pending: int = 10_000
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    # shared by gunicorn workers so that /metrics aggregates all of them
+    multiproc_dir: Path | None = None
+
+
+class SlowQueryConfig(BaseModel):
+    enabled: bool = True
+    threshold_ms: float = 200.0
+    # share of slow SELECTs that also get an EXPLAIN (ANALYZE, BUFFERS) captured in the background
+    explain_sample_rate: float = Field(0.0, ge=0, le=1)
+    explain_concurrency: int = 2
+    explain_timeout: float = 30.0
+
+
+class IndexAdvisorConfig(BaseModel):
+    enabled: bool = True
+    # refuse to start while any finding is reported
+    strict: bool = False
+    seq_scan_ratio: float = Field(0.5, ge=0, le=1)
+    # usage statistics are only trusted once a table has seen this many scans
+    min_scans: int = 1000
+    # small tables are cheaper to scan sequentially anyway
+    min_rows: int = 10_000
+
+
 class GeneralAppConfig(BaseModel):
     title: str = "FastAPI Quick Start"
     mode: Literal["TEST", "DEV"]
@@ -69,6 +154,21 @@ class Settings(BaseSettings):
     app: GeneralAppConfig
     gunicorn: GunicornConfig = GunicornConfig()
     uvicorn: UvicornConfig = UvicornConfig()
+    cache: CacheConfig = CacheConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    slow_query: SlowQueryConfig = SlowQueryConfig()
+    index_advisor: IndexAdvisorConfig = IndexAdvisorConfig()
+    stock_buffer: StockBufferConfig = StockBufferConfig()
+
+    @model_validator(mode="after")
+    def derive_pool_sizes(self) -> Self:
+        # every worker keeps its own pool and one extra LISTEN connection for cache invalidation
+        per_worker = max(self.db.max_connections // max(self.gunicorn.workers, 1) - 1, 1)
+        if self.db.pool_size is None:
+            self.db.pool_size = min(10, per_worker)
+        if self.db.max_overflow is None:
+            self.db.max_overflow = max(min(self.db.pool_size, per_worker - self.db.pool_size), 0)
+        return self
 
     model_config = SettingsConfigDict(
         env_file=(BASE_DIR / ".env",),
@@ -2,10 +2,19 @@ from sqlalchemy import NullPool
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.config import settings
+from src.utils.metrics import instrument_engine
+from src.utils.pool import InstrumentedAsyncPool
+from src.utils.slow_queries import SlowQueryLog
 
 engine = create_async_engine(
     url=settings.db.async_url,
     echo=settings.db.echo,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=settings.db.pool_size,
+    max_overflow=settings.db.max_overflow,
+    pool_timeout=settings.db.pool_timeout,
+    pool_recycle=settings.db.pool_recycle,
+    pool_pre_ping=settings.db.pool_pre_ping,
 )
 
 sessionmaker = async_sessionmaker(
@@ -16,6 +25,27 @@ sessionmaker = async_sessionmaker(
     expire_on_commit=settings.db.expire_on_commit,
 )
 
+engine_replica = None
+sessionmaker_replica = None
+if settings.db.replica_async_url is not None:
+    engine_replica = create_async_engine(
+        url=settings.db.replica_async_url,
+        echo=settings.db.echo,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+        pool_timeout=settings.db.pool_timeout,
+        pool_recycle=settings.db.pool_recycle,
+        pool_pre_ping=settings.db.pool_pre_ping,
+    )
+    sessionmaker_replica = async_sessionmaker(
+        bind=engine_replica,
+        class_=AsyncSession,
+        autocommit=settings.db.autocommit,
+        autoflush=settings.db.autoflush,
+        expire_on_commit=settings.db.expire_on_commit,
+    )
+
 engine_null_pool = create_async_engine(
     url=settings.db.async_url,
     poolclass=NullPool,
@@ -27,3 +57,23 @@ sessionmaker_null_pool = async_sessionmaker(
     autoflush=settings.db.autoflush,
     expire_on_commit=settings.db.expire_on_commit,
 )
+
+if settings.metrics.enabled:
+    instrument_engine(engine)
+    instrument_engine(engine_null_pool)
+    if engine_replica is not None:
+        instrument_engine(engine_replica)
+
+# plans are captured over the pool-less engine so they never compete with requests for connections
+slow_query_log = SlowQueryLog(
+    threshold=settings.slow_query.threshold_ms / 1000,
+    explain_engine=engine_null_pool,
+    sample_rate=settings.slow_query.explain_sample_rate,
+    max_concurrency=settings.slow_query.explain_concurrency,
+    explain_timeout=settings.slow_query.explain_timeout,
+)
+if settings.slow_query.enabled:
+    slow_query_log.attach(engine)
+    slow_query_log.attach(engine_null_pool)
+    if engine_replica is not None:
+        slow_query_log.attach(engine_replica)
@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 from fastapi import FastAPI
 from gunicorn.app.base import BaseApplication
 from gunicorn.config import Config
@@ -28,6 +31,21 @@ class GunicornApp(BaseApplication):
             self.cfg.set(k.lower(), v)
 
 
+def prepare_metrics_dir(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    # files left by a previous master would be summed into the new counters
+    for file in path.glob("*.db"):
+        file.unlink()
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(path)
+
+
+def child_exit(server, worker) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
 def get_app_options(
     host: str,
     port: int,
@@ -47,4 +65,5 @@ def get_app_options(
         "timeout": timeout,
         "reload": reload,
         "logconfig_dict": get_logging_config(),
+        "child_exit": child_exit,
     }
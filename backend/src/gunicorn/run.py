@@ -4,11 +4,15 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from src.config import settings
-from src.gunicorn.app import GunicornApp, get_app_options
-from src.main import app
+from src.gunicorn.app import GunicornApp, get_app_options, prepare_metrics_dir
 
 
 def main():
+    if settings.metrics.enabled and settings.metrics.multiproc_dir is not None:
+        prepare_metrics_dir(settings.metrics.multiproc_dir)
+    # prometheus_client picks its multiprocess mode on import, so the app is loaded once the directory is set
+    from src.main import app
+
     GunicornApp(
         app=app,
         options=get_app_options(
@@ -11,10 +11,14 @@ from fastapi.responses import ORJSONResponse
 
 from src.api import router as main_router
 from src.api.docs import router as docs_router
+from src.api.metrics import router as metrics_router
+from src.cache import cache_listener
 from src.config import settings
-from src.db import engine
+from src.db import engine, engine_replica, slow_query_log
 from src.utils.db_tools import DBHealthChecker
 from src.utils.logconfig import configurate_logging, get_logger
+from src.utils.metrics import MetricsMiddleware, TimedORJSONResponse
+from src.utils.stock_buffer import close_stock_buffers
 
 
 @asynccontextmanager
@@ -23,11 +27,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     helper = DBHealthChecker(engine=engine)
     await helper.check()
+    if settings.index_advisor.enabled:
+        await helper.check_indexes(settings.index_advisor)
     logger.info("All checks passed!")
+    if settings.db.pool_warmup:
+        await helper.warm_up(settings.db.pool_size)  # type: ignore
+
+    if settings.cache.enabled:
+        cache_listener.start()
 
     yield
 
+    await close_stock_buffers()
+    await cache_listener.stop()
+    await slow_query_log.drain()
     await engine.dispose()
+    if engine_replica is not None and engine_replica is not engine:
+        await engine_replica.dispose()
     logger.info("Shutting down...")
 
 
@@ -37,10 +53,13 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url=None,
     redoc_url=None,
-    default_response_class=ORJSONResponse,
+    default_response_class=TimedORJSONResponse if settings.metrics.enabled else ORJSONResponse,
 )
 app.include_router(main_router)
 app.include_router(docs_router)
+if settings.metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+"""products: added index on category_id
+
+Revision ID: 77f0b3b05f07
+Revises: 38c5eeaf601c
+Create Date: 2026-10-17 00:03:54.390092
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "77f0b3b05f07"
+down_revision: Union[str, Sequence[str], None] = "38c5eeaf601c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_products_category_id"),
+        "products",
+        ["category_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_products_category_id"), table_name="products")
@@ -0,0 +1,39 @@
+"""catalog: added indexes on updated_at
+
+Revision ID: 88bd2bb495ef
+Revises: 77f0b3b05f07
+Create Date: 2026-10-17 01:12:08.511246
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "88bd2bb495ef"
+down_revision: Union[str, Sequence[str], None] = "77f0b3b05f07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f("ix_categories_updated_at"),
+        "categories",
+        ["updated_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_products_updated_at"),
+        "products",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_products_updated_at"), table_name="products")
+    op.drop_index(op.f("ix_categories_updated_at"), table_name="categories")
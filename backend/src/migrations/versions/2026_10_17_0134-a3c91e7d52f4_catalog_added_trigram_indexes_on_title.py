@@ -0,0 +1,53 @@
+"""catalog: added trigram indexes on title
+
+Revision ID: a3c91e7d52f4
+Revises: 5f317745264e
+Create Date: 2026-10-17 01:34:08.412907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c91e7d52f4"
+down_revision: Union[str, Sequence[str], None] = "5f317745264e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_products_title_trgm",
+        "products",
+        ["title"],
+        unique=False,
+        postgresql_using="gist",
+        postgresql_ops={"title": "gist_trgm_ops"},
+    )
+    op.create_index(
+        "ix_categories_title_trgm",
+        "categories",
+        ["title"],
+        unique=False,
+        postgresql_using="gist",
+        postgresql_ops={"title": "gist_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_categories_title_trgm",
+        table_name="categories",
+        postgresql_using="gist",
+    )
+    op.drop_index(
+        "ix_products_title_trgm",
+        table_name="products",
+        postgresql_using="gist",
+    )
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
@@ -0,0 +1,75 @@
+"""products: added composite listing indexes
+
+Revision ID: c7d2e4a19b03
+Revises: a3c91e7d52f4
+Create Date: 2026-10-17 01:51:44.208315
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d2e4a19b03"
+down_revision: Union[str, Sequence[str], None] = "a3c91e7d52f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f("ix_products_category_id"), table_name="products")
+    op.drop_index(op.f("ix_products_updated_at"), table_name="products")
+    op.create_index(
+        "ix_products_category_id_price_id",
+        "products",
+        ["category_id", "price", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_price_id",
+        "products",
+        ["price", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_created_at_id",
+        "products",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_updated_at_id",
+        "products",
+        ["updated_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_products_title_pattern",
+        "products",
+        ["title"],
+        unique=False,
+        postgresql_ops={"title": "text_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_title_pattern", table_name="products")
+    op.drop_index("ix_products_updated_at_id", table_name="products")
+    op.drop_index("ix_products_created_at_id", table_name="products")
+    op.drop_index("ix_products_price_id", table_name="products")
+    op.drop_index("ix_products_category_id_price_id", table_name="products")
+    op.create_index(
+        op.f("ix_products_updated_at"),
+        "products",
+        ["updated_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_products_category_id"),
+        "products",
+        ["category_id"],
+        unique=False,
+    )
@@ -0,0 +1,87 @@
+"""catalog: added version counters
+
+Revision ID: e41b7a0c9d25
+Revises: c7d2e4a19b03
+Create Date: 2026-10-17 02:12:37.840152
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e41b7a0c9d25"
+down_revision: Union[str, Sequence[str], None] = "c7d2e4a19b03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("categories", "products")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "catalog_versions",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint(
+            "table_name", "shard", name=op.f("pk_catalog_versions")
+        ),
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+        BEGIN
+            -- one bump per table and transaction, however many rows it touched
+            IF current_setting('catalog_versions.' || TG_TABLE_NAME, true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            PERFORM set_config('catalog_versions.' || TG_TABLE_NAME, 'on', true);
+            INSERT INTO catalog_versions (table_name, shard, version, created_at, updated_at)
+            VALUES (TG_TABLE_NAME, mod(pg_backend_pid(), 16), 1, clock_timestamp(), clock_timestamp())
+            ON CONFLICT (table_name, shard)
+            DO UPDATE SET version = catalog_versions.version + 1, updated_at = clock_timestamp();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """)
+    for table in TABLES:
+        # existing rows keep their last modification time as the starting point
+        op.execute(
+            f"INSERT INTO catalog_versions (table_name, shard, version, updated_at) "
+            f"SELECT '{table}', 0, 0, coalesce(max(updated_at), now()) FROM {table}"
+        )
+        op.execute(
+            f"CREATE CONSTRAINT TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW "
+            "EXECUTE FUNCTION bump_catalog_version()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version_on_truncate "
+            f"AFTER TRUNCATE ON {table} FOR EACH STATEMENT "
+            "EXECUTE FUNCTION bump_catalog_version()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_version_on_truncate ON {table}")
+        op.execute(f"DROP TRIGGER {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION bump_catalog_version()")
+    op.drop_table("catalog_versions")
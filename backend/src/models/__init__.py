@@ -1,3 +1,4 @@
 # ruff: noqa: F401
+from src.models.catalog_version import CatalogVersion
 from src.models.category import Category
 from src.models.product import Product
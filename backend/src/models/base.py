@@ -1,4 +1,4 @@
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, inspect
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -25,7 +25,9 @@ class Base(AsyncAttrs, DeclarativeBase, TimingMixin):
 
     def to_dict(self) -> dict:
         columns = class_mapper(self.__class__).columns
-        return {column.key: getattr(self, column.key) for column in columns}
+        # deferred columns that were not loaded would need IO, which async sessions can't do implicitly
+        unloaded = inspect(self).unloaded
+        return {column.key: getattr(self, column.key) for column in columns if column.key not in unloaded}
 
     def __repr__(self):
         cols = []
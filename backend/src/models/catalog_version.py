@@ -0,0 +1,50 @@
+from sqlalchemy import DDL, BigInteger, SmallInteger, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+from src.models.category import Category
+from src.models.product import Product
+
+# writers bump the row of their backend's shard, so concurrent commits rarely wait on each other
+VERSION_SHARDS = 16
+
+BUMP_CATALOG_VERSION = f"""
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+BEGIN
+    -- one bump per table and transaction, however many rows it touched
+    IF current_setting('catalog_versions.' || TG_TABLE_NAME, true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    PERFORM set_config('catalog_versions.' || TG_TABLE_NAME, 'on', true);
+    INSERT INTO catalog_versions (table_name, shard, version, created_at, updated_at)
+    VALUES (TG_TABLE_NAME, mod(pg_backend_pid(), {VERSION_SHARDS}), 1, clock_timestamp(), clock_timestamp())
+    ON CONFLICT (table_name, shard)
+    DO UPDATE SET version = catalog_versions.version + 1, updated_at = clock_timestamp();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def version_triggers(table: str) -> list[str]:
+    # deferred to commit, so the shard row is locked only after every other lock of the transaction is held
+    return [
+        f"CREATE CONSTRAINT TRIGGER {table}_bump_version AFTER INSERT OR UPDATE OR DELETE ON {table} "
+        "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_catalog_version()",
+        f"CREATE TRIGGER {table}_bump_version_on_truncate AFTER TRUNCATE ON {table} "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version()",
+    ]
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_versions"
+
+    table_name: Mapped[str] = mapped_column(String(length=63), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+event.listen(Base.metadata, "before_create", DDL(BUMP_CATALOG_VERSION))
+for model in (Category, Product):
+    for statement in version_triggers(model.__tablename__):
+        event.listen(model.__table__, "after_create", DDL(statement))
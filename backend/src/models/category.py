@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, Integer, String, Text
+from sqlalchemy import CheckConstraint, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
+from src.models.extensions import has_pg_trgm
 
 if TYPE_CHECKING:
     from src.models.product import Product
@@ -18,7 +19,16 @@ class Category(Base):
 
     products: Mapped[list["Product"]] = relationship(
         argument="Product",
-        lazy="selectin",
+        lazy="raise",
     )
 
-    __table_args__ = (CheckConstraint("length(title) > 0", name="title_length_positive"),)
+    __table_args__ = (
+        CheckConstraint("length(title) > 0", name="title_length_positive"),
+        Index("ix_categories_updated_at", "updated_at"),
+        Index(
+            "ix_categories_title_trgm",
+            "title",
+            postgresql_using="gist",
+            postgresql_ops={"title": "gist_trgm_ops"},
+        ).ddl_if(callable_=has_pg_trgm),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import DDL, Connection, event, text
+
+from src.models.base import Base
+
+PG_TRGM = "pg_trgm"
+
+
+def has_pg_trgm(ddl, target, bind: Connection, **kw) -> bool:
+    # create_all only; migrations install the extension unconditionally
+    query = text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = :name)")
+    return bool(bind.execute(query, {"name": PG_TRGM}).scalar())
+
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL(f"CREATE EXTENSION IF NOT EXISTS {PG_TRGM}").execute_if(callable_=has_pg_trgm),
+)
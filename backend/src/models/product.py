@@ -1,8 +1,10 @@
-from sqlalchemy import CheckConstraint, ForeignKey, Integer, String, Text
+from sqlalchemy import CheckConstraint, Computed, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.base import Base
 from src.models.category import Category
+from src.models.extensions import has_pg_trgm
 
 
 class Product(Base):
@@ -14,9 +16,31 @@ class Product(Base):
     price: Mapped[float]
     quantity: Mapped[int] = mapped_column(Integer(), default=0)
     category_id: Mapped[int] = mapped_column(Integer, ForeignKey(f"{Category.__tablename__}.id"))
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     __table_args__ = (
         CheckConstraint("price >= 0", name="price_positive"),
         CheckConstraint("quantity >= 0", name="quantity_positive"),
         CheckConstraint("length(title) > 0", name="title_length_positive"),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+        # listing filters and keyset sorts; id is the tie breaker of every cursor
+        Index("ix_products_category_id_price_id", "category_id", "price", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_created_at_id", "created_at", "id"),
+        Index("ix_products_updated_at_id", "updated_at", "id"),
+        Index("ix_products_title_pattern", "title", postgresql_ops={"title": "text_pattern_ops"}),
+        Index(
+            "ix_products_title_trgm",
+            "title",
+            postgresql_using="gist",
+            postgresql_ops={"title": "gist_trgm_ops"},
+        ).ddl_if(callable_=has_pg_trgm),
     )
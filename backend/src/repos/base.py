@@ -1,50 +1,146 @@
-from typing import Generic, Sequence
+from functools import cache
+from typing import Any, AsyncIterator, Generic, Iterable, Mapping, Sequence
 
-from asyncpg import CheckViolationError, DataError, ForeignKeyViolationError, UniqueViolationError
-from sqlalchemy import delete, insert, select, update
+from asyncpg import CheckViolationError, DataError, ForeignKeyViolationError, PostgresError, UniqueViolationError
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Float,
+    Integer,
+    Result,
+    Select,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import DBAPIError, IntegrityError, NoResultFound
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.config import settings
+from src.models.base import Base
+from src.models.catalog_version import CatalogVersion
 from src.repos.mappers.base import (
     DataMapper,
     ModelType,
     SchemaAddType,
     SchemaReturnType,
     SchemaUpdateType,
+    get_list_adapter,
 )
+from src.schemas.base import BaseDTO
+from src.schemas.version import VersionDTO
+from src.utils.batching import BatchLoader
 from src.utils.exceptions import (
+    InvalidPageSizeError,
+    InvalidSortFieldError,
     ObjectAlreadyExistsError,
     ObjectInvalidValueError,
     ObjectNotFoundError,
     RelatedObjectExistsError,
     ValueOutOfRangeError,
 )
+from src.utils.limits import INT4_MAX, INT4_MIN
+from src.utils.pagination import decode_cursor, encode_cursor
+from src.utils.tracing import trace_methods
+
+# asyncpg binds at most 32767 parameters per statement
+MAX_QUERY_PARAMS = 32767
+
+
+@cache
+def _batch_loader(repo: type["BaseRepo"], session_factory: async_sessionmaker) -> BatchLoader:
+    async def load_many(ids: list[int]) -> dict[int, Any]:
+        async with session_factory() as session:
+            return await repo(session).get_by_ids(ids)
+
+    return BatchLoader(
+        load_many,
+        name=repo.__name__,
+        window=settings.db.batch_window_ms / 1000,
+        max_batch_size=settings.db.batch_max_size,
+    )
 
 
 class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateType]):
     model: type[ModelType]
     schema: type[SchemaReturnType]
     mapper: type[DataMapper[ModelType, SchemaReturnType]]
+    sort_fields: tuple[str, ...] = ("id",)
+    conflict_fields: tuple[str, ...]
+    similarity_field: str = "title"
+    similarity_schema: type[BaseDTO]
 
     def __handle_integrity_error(self, exc: IntegrityError) -> None:
-        if exc.orig and isinstance(exc.orig.__cause__, UniqueViolationError):
+        if exc.orig:
+            self.__handle_violation(exc.orig.__cause__, exc)
+
+    def __handle_violation(self, cause: BaseException | None, exc: Exception) -> None:
+        if isinstance(cause, UniqueViolationError):
             raise ObjectAlreadyExistsError from exc
-        if exc.orig and isinstance(exc.orig.__cause__, CheckViolationError):
+        if isinstance(cause, CheckViolationError):
             raise ObjectInvalidValueError from exc
-        if exc.orig and isinstance(exc.orig.__cause__, ForeignKeyViolationError):
+        if isinstance(cause, ForeignKeyViolationError):
             raise ObjectNotFoundError from exc
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        trace_methods(cls)
+
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.core_reads = settings.db.core_reads
+
+    @property
+    def read_columns(self) -> list[Column]:
+        return [column for column in self.model.__table__.columns if column.key in self.schema.model_fields]
+
+    def _read_query(self) -> Select:
+        if self.core_reads:
+            return select(*self.read_columns)
+        return select(self.model)
+
+    def _read_rows(self, result: Result) -> Sequence[Any]:
+        if self.core_reads:
+            return result.all()
+        return result.scalars().all()
+
+    def _track_write(self, ids: Iterable[int] | None = None) -> None:
+        # collected per transaction and flushed to the cache by DBManager.commit
+        writes: dict[str, set[int] | None] = self.session.info.setdefault("writes", {})
+        table = self.model.__tablename__
+        if ids is None:
+            writes[table] = None
+        elif writes.get(table, set()) is not None:
+            writes.setdefault(table, set()).update(ids)
+
+    @staticmethod
+    def _filtered_ids(filter: tuple, filter_by: dict[str, Any]) -> set[int] | None:
+        if filter or set(filter_by) != {"id"}:
+            return None
+        return {filter_by["id"]}
 
     async def get_all_filtered(
         self,
         *filter,
         offset: int | None = None,
         limit: int | None = None,
+        sort_by: str = "id",
+        descending: bool = False,
         **filter_by,
     ) -> list[SchemaReturnType]:
-        query = select(self.model).filter(*filter).filter_by(**filter_by)
+        query = self._read_query().filter(*filter).filter_by(**filter_by).order_by(*self._order_by(sort_by, descending))
         if offset is not None:
             query = query.offset(offset)
         if limit is not None:
@@ -55,7 +151,24 @@ class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateT
             if exc.orig and isinstance(exc.orig.__cause__, DataError):
                 raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
             raise exc
-        return [self.mapper.map_to_domain_entity(item) for item in result.scalars().all()]
+        return self.mapper.map_to_domain_entities(self._read_rows(result))
+
+    async def stream_all(self, *filter, batch_size: int = 1000, **filter_by) -> AsyncIterator[list[SchemaReturnType]]:
+        query = (
+            select(*self.read_columns)
+            .filter(*filter)
+            .filter_by(**filter_by)
+            .order_by(self.model.id)  # type: ignore
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            result = await self.session.stream(query)
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            raise exc
+        async for rows in result.partitions(batch_size):
+            yield self.mapper.map_to_domain_entities(rows)
 
     async def get_all(
         self,
@@ -67,11 +180,85 @@ class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateT
             limit=limit,
         )
 
+    async def get_version(self) -> VersionDTO:
+        return await self._get_version(self.model)
+
+    async def _get_version(self, *models: type[Base]) -> VersionDTO:
+        # a few primary key rows kept current by triggers, instead of aggregating the tables themselves
+        query = select(
+            func.max(CatalogVersion.updated_at).label("last_modified"),
+            cast(func.coalesce(func.sum(CatalogVersion.version), 0), BigInteger).label("version"),
+        ).where(CatalogVersion.table_name.in_([model.__tablename__ for model in models]))
+        result = await self.session.execute(query)
+        return VersionDTO.model_validate(result.one())
+
+    async def get_page(
+        self,
+        *filter,
+        cursor: str | None = None,
+        limit: int = 50,
+        sort_by: str = "id",
+        descending: bool = False,
+        **filter_by,
+    ) -> tuple[list[SchemaReturnType], str | None]:
+        if limit < 1:
+            raise InvalidPageSizeError
+        order_by = self._order_by(sort_by, descending)
+        id_column = self.model.id  # type: ignore
+        sort_column = getattr(self.model, sort_by)
+        query = self._read_query().filter(*filter).filter_by(**filter_by)
+        if cursor is not None:
+            sort_value, last_id = decode_cursor(cursor, sort_by, sort_column.type.python_type)
+            query = query.filter(self._keyset_clause(sort_column, id_column, sort_value, last_id, descending))
+        query = query.order_by(*order_by).limit(limit + 1)
+        try:
+            result = await self.session.execute(query)
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            raise exc
+
+        objs = self._read_rows(result)
+        next_cursor = None
+        if len(objs) > limit:
+            objs = objs[:limit]
+            next_cursor = encode_cursor(sort_by, getattr(objs[-1], sort_by), objs[-1].id)  # type: ignore
+        return self.mapper.map_to_domain_entities(objs), next_cursor
+
+    async def get_similar(self, text: str, limit: int = 10, threshold: float = 0.3) -> list[BaseDTO]:
+        column = getattr(self.model, self.similarity_field)
+        distance = column.op("<->", return_type=Float)(text)
+        # plain KNN ordering walks the trigram GiST index and stops after `limit` rows,
+        # the threshold is applied to those few instead of scanning everything similar
+        nearest = select(*self.read_columns, distance.label("distance")).order_by(distance).limit(limit).subquery()
+        query = (
+            select(*(nearest.c[column.key] for column in self.read_columns), (1 - nearest.c.distance).label("similarity"))
+            .where(nearest.c.distance <= 1 - threshold)
+            .order_by(nearest.c.distance, nearest.c.id)
+        )
+        result = await self.session.execute(query)
+        return get_list_adapter(self.similarity_schema).validate_python([row._asdict() for row in result.all()])
+
+    def _order_by(self, sort_by: str, descending: bool) -> list:
+        if sort_by not in self.sort_fields:
+            raise InvalidSortFieldError(detail=f"Unsupported sort field: {sort_by!r}")
+        id_column = self.model.id  # type: ignore
+        sort_column = getattr(self.model, sort_by)
+        order_by = [sort_column] if sort_column is id_column else [sort_column, id_column]
+        return [column.desc() for column in order_by] if descending else order_by
+
+    @staticmethod
+    def _keyset_clause(sort_column, id_column, sort_value: Any, last_id: int, descending: bool):
+        if sort_column is id_column:
+            return id_column < last_id if descending else id_column > last_id
+        key = tuple_(sort_column, id_column)
+        return key < tuple_(sort_value, last_id) if descending else key > tuple_(sort_value, last_id)
+
     async def get_one_or_none(self, *filter, **filter_by) -> SchemaReturnType | None:
-        query = select(self.model).filter(*filter).filter_by(**filter_by)
+        query = self._read_query().filter(*filter).filter_by(**filter_by)
         try:
             result = await self.session.execute(query)
-            obj = result.scalars().one_or_none()
+            obj = result.one_or_none() if self.core_reads else result.scalars().one_or_none()
         except DBAPIError as exc:
             if exc.orig and isinstance(exc.orig.__cause__, DataError):
                 raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
@@ -81,11 +268,32 @@ class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateT
             return None
         return self.mapper.map_to_domain_entity(obj)
 
+    async def get_by_ids(self, ids: Sequence[int]) -> dict[int, SchemaReturnType]:
+        # a single array parameter keeps the statement text, and its prepared plan, the same for any number of ids
+        query = self._read_query().where(self.model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer))))  # type: ignore
+        try:
+            result = await self.session.execute(query)
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            raise exc
+        return {entity.id: entity for entity in self.mapper.map_to_domain_entities(self._read_rows(result))}  # type: ignore
+
+    async def get_many(self, ids: Sequence[int]) -> tuple[list[SchemaReturnType], list[int]]:
+        wanted = list(dict.fromkeys(ids))
+        # ids that don't fit the column can't exist, they are reported missing instead of failing the query
+        found = await self.get_by_ids([id for id in wanted if INT4_MIN <= id <= INT4_MAX]) if wanted else {}
+        return [found[id] for id in wanted if id in found], [id for id in wanted if id not in found]
+
+    @classmethod
+    def batch_loader(cls, session_factory: async_sessionmaker) -> BatchLoader[SchemaReturnType]:
+        return _batch_loader(cls, session_factory)
+
     async def get_one(self, *filter, **filter_by) -> SchemaReturnType:
-        query = select(self.model).filter(*filter).filter_by(**filter_by)
+        query = self._read_query().filter(*filter).filter_by(**filter_by)
         try:
             result = await self.session.execute(query)
-            obj = result.scalar_one()
+            obj = result.one() if self.core_reads else result.scalar_one()
         except NoResultFound:
             raise ObjectNotFoundError
         except DBAPIError as exc:
@@ -95,33 +303,148 @@ class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateT
 
         return self.mapper.map_to_domain_entity(obj)
 
-    async def add_bulk(self, data: Sequence[SchemaAddType]) -> list[SchemaReturnType]:
-        add_obj_stmt = insert(self.model).values([item.model_dump() for item in data]).returning(self.model)
+    async def add_bulk(self, data: Sequence[SchemaAddType], chunk_size: int | None = None) -> list[SchemaReturnType]:
+        if not data:
+            return []
+        chunk_size = chunk_size or MAX_QUERY_PARAMS // len(type(data[0]).model_fields)
+
+        objs = []
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start : start + chunk_size]
+            add_obj_stmt = insert(self.model).values([item.model_dump() for item in chunk])
+            try:
+                result = await self.session.execute(add_obj_stmt.returning(*self.read_columns))
+            except IntegrityError as exc:
+                self.__handle_integrity_error(exc)
+                raise exc
+            objs.extend(result.all())
+        entities = self.mapper.map_to_domain_entities(objs)
+        self._track_write(entity.id for entity in entities)  # type: ignore
+        return entities
+
+    async def copy_bulk(self, data: Sequence[SchemaAddType], chunk_size: int = 10_000) -> int:
+        if not data:
+            return 0
+        columns = list(type(data[0]).model_fields)
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        if not driver_connection.is_in_transaction():  # type: ignore
+            # COPY bypasses SQLAlchemy, so make sure the session transaction is open on the driver
+            await connection.exec_driver_sql("SELECT 1")
+
         try:
-            result = await self.session.execute(add_obj_stmt)
-        except IntegrityError as exc:
-            self.__handle_integrity_error(exc)
+            for start in range(0, len(data), chunk_size):
+                await driver_connection.copy_records_to_table(  # type: ignore
+                    self.model.__tablename__,
+                    records=[tuple(getattr(item, column) for column in columns) for item in data[start : start + chunk_size]],
+                    columns=columns,
+                )
+        except PostgresError as exc:
+            self.__handle_violation(exc, exc)
             raise exc
-        objs = result.scalars().all()
-        return [self.mapper.map_to_domain_entity(item) for item in objs]
+        self._track_write()
+        return len(data)
 
     async def add(self, data: SchemaAddType, **params) -> SchemaReturnType:
-        add_obj_stmt = insert(self.model).values(**data.model_dump(), **params).returning(self.model)
+        add_obj_stmt = insert(self.model).values(**data.model_dump(), **params)
         try:
-            result = await self.session.execute(add_obj_stmt)
+            result = await self.session.execute(add_obj_stmt.returning(*self.read_columns))
         except IntegrityError as exc:
             self.__handle_integrity_error(exc)
             raise exc
 
-        obj = result.scalars().one()
+        obj = result.one()
+        self._track_write([obj.id])
         return self.mapper.map_to_domain_entity(obj)
 
     async def get_one_or_add(self, data: SchemaAddType, **params) -> tuple[bool, SchemaReturnType]:
-        obj = await self.get_one_or_none(**data.model_dump())
-        will_be_created = obj is None
-        if will_be_created:
-            obj = await self.add(data, **params)
-        return (will_be_created, obj)
+        (result,) = await self._upsert_values([{**data.model_dump(), **params}])
+        return result
+
+    async def upsert(self, data: SchemaAddType, update_fields: Sequence[str] | None = None) -> tuple[bool, SchemaReturnType]:
+        (result,) = await self._upsert_values([data.model_dump()], update_fields=update_fields)
+        return result
+
+    async def upsert_bulk(
+        self,
+        data: Sequence[SchemaAddType],
+        update_fields: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> list[tuple[bool, SchemaReturnType]]:
+        return await self._upsert_values(
+            [item.model_dump() for item in data],
+            update_fields=update_fields,
+            chunk_size=chunk_size,
+        )
+
+    async def _upsert_values(
+        self,
+        values: list[dict[str, Any]],
+        update_fields: Sequence[str] | None = None,
+        chunk_size: int | None = None,
+    ) -> list[tuple[bool, SchemaReturnType]]:
+        if not values:
+            return []
+        unknown = set(update_fields or ()) - set(values[0])
+        if unknown:
+            raise ObjectInvalidValueError(detail=f"Unknown update fields: {', '.join(sorted(unknown))}")
+
+        # ON CONFLICT cannot touch the same row twice in one statement, so the last duplicate wins
+        keys = [tuple(item[field] for field in self.conflict_fields) for item in values]
+        unique_values = list(dict(zip(keys, values)).values())
+        chunk_size = chunk_size or MAX_QUERY_PARAMS // len(unique_values[0])
+
+        table = self.model.__table__
+        conflict_columns = [table.c[field] for field in self.conflict_fields]
+        outcomes: dict[tuple, tuple[bool, SchemaReturnType]] = {}
+        for start in range(0, len(unique_values), chunk_size):
+            stmt = pg_insert(self.model).values(unique_values[start : start + chunk_size])
+            if update_fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={**{field: stmt.excluded[field] for field in update_fields}, "updated_at": func.now()},
+                    # unchanged rows are left alone and reported as existing
+                    where=or_(*(table.c[field].is_distinct_from(stmt.excluded[field]) for field in update_fields)),
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+            stmt = stmt.returning(*self.read_columns, literal_column("xmax = 0").label("inserted"))
+            try:
+                result = await self.session.execute(stmt)
+            except IntegrityError as exc:
+                self.__handle_integrity_error(exc)
+                raise exc
+            rows = result.all()
+            for row in rows:
+                key = tuple(getattr(row, field) for field in self.conflict_fields)
+                outcomes[key] = (row.inserted, self.mapper.map_to_domain_entity(row))  # type: ignore
+            self._track_write(row.id for row in rows)
+
+        untouched = [key for key in dict.fromkeys(keys) if key not in outcomes]
+        if untouched:
+            # one array per conflict column keeps the lookup at a fixed number of binds however many keys there are
+            wanted = (
+                func.unnest(
+                    *(
+                        cast(bindparam(f"wanted_{field}", [key[i] for key in untouched]), ARRAY(table.c[field].type))
+                        for i, field in enumerate(self.conflict_fields)
+                    )
+                )
+                .table_valued(*(column(field, table.c[field].type) for field in self.conflict_fields))
+                .render_derived(name="wanted")
+            )
+            query = select(*self.read_columns).join(
+                wanted, and_(*(table.c[field] == wanted.c[field] for field in self.conflict_fields))
+            )
+            result = await self.session.execute(query)
+            for row in result.all():
+                key = tuple(getattr(row, field) for field in self.conflict_fields)
+                outcomes[key] = (False, self.mapper.map_to_domain_entity(row))  # type: ignore
+
+        # a conflicting row deleted concurrently between the two statements has nothing left to report
+        return [outcomes[key] for key in keys if key in outcomes]
 
     async def edit(
         self,
@@ -150,8 +473,86 @@ class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateT
             if exc.orig and isinstance(exc.orig.__cause__, DataError):
                 raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
             raise exc
+        self._track_write(self._filtered_ids(filter, filter_by))
         return True
 
+    async def edit_bulk(
+        self,
+        data: Mapping[int, SchemaUpdateType],
+        exclude_unset: bool = True,
+        chunk_size: int = 5000,
+    ) -> dict[int, bool]:
+        outcomes = dict.fromkeys(data, False)
+        # rows setting the same fields share a statement; each field travels as one typed array
+        groups: dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]] = {}
+        for id, item in data.items():
+            values = item.model_dump(exclude_unset=exclude_unset)
+            if values and INT4_MIN <= id <= INT4_MAX:
+                groups.setdefault(tuple(sorted(values)), []).append((id, values))
+
+        table = self.model.__table__
+        for fields, rows in groups.items():
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start : start + chunk_size]
+                arrays = [cast(bindparam("ids", [id for id, _ in chunk]), ARRAY(Integer))]
+                arrays.extend(
+                    cast(bindparam(f"incoming_{field}", [values[field] for _, values in chunk]), ARRAY(table.c[field].type))
+                    for field in fields
+                )
+                source = (
+                    func.unnest(*arrays)
+                    .table_valued(column("id", Integer), *(column(field, table.c[field].type) for field in fields))
+                    .render_derived(name="incoming")
+                )
+                stmt = (
+                    update(self.model)
+                    .where(self.model.id == source.c.id)  # type: ignore
+                    .values({field: source.c[field] for field in fields})
+                    .returning(self.model.id)  # type: ignore
+                )
+                try:
+                    result = await self.session.execute(stmt)
+                except IntegrityError as exc:
+                    self.__handle_integrity_error(exc)
+                    raise exc
+                except DBAPIError as exc:
+                    if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                        raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+                    raise exc
+                outcomes.update(dict.fromkeys(result.scalars(), True))
+
+        self._track_write([id for id, updated in outcomes.items() if updated])
+        return outcomes
+
+    async def edit_returning(
+        self,
+        data: SchemaUpdateType,
+        exclude_unset: bool = True,
+        exclude_fields: set[str] | None = None,
+        *filter,
+        **filter_by,
+    ) -> SchemaReturnType:
+        exclude_fields = exclude_fields or set()
+        to_update = data.model_dump(exclude=exclude_fields, exclude_unset=exclude_unset)
+        if not to_update:
+            return await self.get_one(*filter, **filter_by)
+        edit_obj_stmt = update(self.model).filter(*filter).filter_by(**filter_by).values(**to_update)
+
+        try:
+            result = await self.session.execute(edit_obj_stmt.returning(*self.read_columns))
+            obj = result.one()
+        except NoResultFound:
+            raise ObjectNotFoundError
+        except IntegrityError as exc:
+            self.__handle_integrity_error(exc)
+            raise exc
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            raise exc
+        self._track_write([obj.id])
+        return self.mapper.map_to_domain_entity(obj)  # type: ignore
+
     async def delete(self, *filter, ensure_existence=True, **filter_by) -> bool:
         if ensure_existence:
             await self.get_one(*filter, **filter_by)
@@ -166,6 +567,7 @@ class BaseRepo(Generic[ModelType, SchemaReturnType, SchemaAddType, SchemaUpdateT
                 raise RelatedObjectExistsError from exc
             raise exc
 
+        self._track_write(self._filtered_ids(filter, filter_by))
         return True
 
     async def delete_all(self, ensure_existence=False) -> bool:
@@ -1,25 +1,137 @@
-from asyncpg import DataError
-from sqlalchemy import select
+from collections import defaultdict
+from typing import Sequence
+
+from asyncpg import DataError, ForeignKeyViolationError
+from sqlalchemy import delete, exists, func, select
 from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.models.category import Category
+from src.models.product import Product
 from src.repos.base import BaseRepo
+from src.repos.mappers.base import get_list_adapter
 from src.repos.mappers.mappers import CategoryMapper
-from src.schemas.category import CategoryAddDTO, CategoryDTO, CategoryUpdateDTO, CategoryWithProductsDTO
-from src.utils.exceptions import ValueOutOfRangeError
+from src.schemas.category import (
+    CategoryAddDTO,
+    CategoryDTO,
+    CategoryProductsLoad,
+    CategorySimilarityDTO,
+    CategorySummaryDTO,
+    CategoryUpdateDTO,
+    CategoryWithProductsDTO,
+)
+from src.schemas.version import VersionDTO
+from src.utils.exceptions import ObjectNotFoundError, RelatedObjectExistsError, ValueOutOfRangeError
 
 
 class CategoryRepo(BaseRepo[Category, CategoryDTO, CategoryAddDTO, CategoryUpdateDTO]):
     model = Category
     schema = CategoryDTO
     mapper = CategoryMapper
+    conflict_fields = ("title",)
+    sort_fields = ("id", "title", "created_at", "updated_at")
+    similarity_schema = CategorySimilarityDTO
+
+    async def get_all_filtered(  # type: ignore
+        self,
+        *filter,
+        offset: int | None = None,
+        limit: int | None = None,
+        products: CategoryProductsLoad = CategoryProductsLoad.FULL,
+        products_limit: int = 10,
+        **filter_by,
+    ) -> list[CategoryDTO]:
+        if products == CategoryProductsLoad.COUNT:
+            products_count = (
+                select(func.count(Product.id))
+                .where(Product.category_id == Category.id)
+                .correlate(Category)
+                .scalar_subquery()
+                .label("products_count")
+            )
+            query = select(*Category.__table__.columns, products_count)
+        elif products == CategoryProductsLoad.NONE:
+            query = self._read_query()
+        else:
+            query = select(self.model)
+            if products == CategoryProductsLoad.FULL:
+                query = query.options(selectinload(Category.products))
 
-    async def get_all_filtered(self, *filter, **filter_by) -> list[CategoryWithProductsDTO]:  # type: ignore
-        query = select(self.model).filter(*filter).filter_by(**filter_by).order_by(self.model.id)  # type: ignore
+        query = query.filter(*filter).filter_by(**filter_by).order_by(Category.id)
+        if offset is not None:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
         try:
             result = await self.session.execute(query)
         except DBAPIError as exc:
             if exc.orig and isinstance(exc.orig.__cause__, DataError):
                 raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
             raise exc
-        return [CategoryWithProductsDTO.model_validate(item) for item in result.scalars().all()]
+
+        if products == CategoryProductsLoad.NONE:
+            return self.mapper.map_to_domain_entities(self._read_rows(result))
+        if products == CategoryProductsLoad.COUNT:
+            return get_list_adapter(CategorySummaryDTO).validate_python([row._asdict() for row in result.all()])
+
+        categories = result.scalars().all()
+        if products == CategoryProductsLoad.FIRST:
+            await self._attach_first_products(categories, products_limit)
+        return get_list_adapter(CategoryWithProductsDTO).validate_python(categories, from_attributes=True)
+
+    async def get_version(self, products: CategoryProductsLoad = CategoryProductsLoad.NONE) -> VersionDTO:  # type: ignore
+        if products == CategoryProductsLoad.NONE:
+            return await self._get_version(Category)
+        return await self._get_version(Category, Product)
+
+    async def _attach_first_products(self, categories: Sequence[Category], products_limit: int) -> None:
+        if not categories:
+            return
+        ranked = (
+            select(
+                Product,
+                func.row_number().over(partition_by=Product.category_id, order_by=Product.id).label("position"),
+            )
+            .where(Product.category_id.in_([category.id for category in categories]))
+            .subquery()
+        )
+        ranked_product = aliased(Product, ranked)
+        query = select(ranked_product).where(ranked.c.position <= products_limit)
+        result = await self.session.execute(query.order_by(ranked.c.category_id, ranked.c.position))
+
+        grouped: defaultdict[int, list[Product]] = defaultdict(list)
+        for product in result.scalars().all():
+            grouped[product.category_id].append(product)
+        for category in categories:
+            set_committed_value(category, "products", grouped[category.id])
+
+    async def delete_without_products(self, id: int) -> bool:
+        target = (
+            select(Category.id, exists().where(Product.category_id == id).label("has_products"))
+            .where(Category.id == id)
+            .cte("target")
+        )
+        deleted = (
+            delete(Category.__table__)
+            .where(Category.id.in_(select(target.c.id).where(~target.c.has_products)))
+            .returning(Category.id)
+            .cte("deleted")
+        )
+        query = select(target.c.has_products).select_from(target.outerjoin(deleted, deleted.c.id == target.c.id))
+        try:
+            result = await self.session.execute(query)
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            if exc.orig and isinstance(exc.orig.__cause__, ForeignKeyViolationError):
+                raise RelatedObjectExistsError from exc
+            raise exc
+
+        has_products = result.scalar_one_or_none()
+        if has_products is None:
+            raise ObjectNotFoundError
+        if has_products:
+            raise RelatedObjectExistsError
+        self._track_write([id])
+        return True
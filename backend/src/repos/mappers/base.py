@@ -1,6 +1,10 @@
-from typing import Generic, TypeVar
+from functools import cache
+from typing import Any, Generic, Iterable, TypeVar
 
-# from sqlalchemy import Row, RowMapping
+from pydantic import TypeAdapter
+from sqlalchemy import Row
+
+from src.config import settings
 from src.models.base import Base
 from src.schemas.base import BaseDTO
 
@@ -10,14 +14,48 @@ SchemaUpdateType = TypeVar("SchemaUpdateType", bound=BaseDTO)
 SchemaAddType = TypeVar("SchemaAddType", bound=BaseDTO)
 
 
+@cache
+def get_list_adapter(schema: type[SchemaReturnType]) -> TypeAdapter[list[SchemaReturnType]]:
+    return TypeAdapter(list[schema])  # type: ignore
+
+
+def construct_trusted(schema: type[SchemaReturnType], items: Iterable[Any]) -> list[SchemaReturnType]:
+    # skips validation entirely: only for flat schemas filled with values read back from the database
+    fields = tuple(schema.model_fields)
+    fields_set = set(fields)
+    construct = schema.model_construct
+    entities = []
+    for item in items:
+        if isinstance(item, Row):
+            values = item._mapping
+            data = {field: values[field] for field in fields}
+        else:
+            data = {field: getattr(item, field) for field in fields}
+        entities.append(construct(fields_set, **data))
+    return entities
+
+
 class DataMapper(Generic[ModelType, SchemaReturnType]):
     model: type[ModelType]
     schema: type[SchemaReturnType]
 
     @classmethod
-    def map_to_domain_entity(cls, db_model: ModelType) -> SchemaReturnType:
+    def map_to_domain_entity(cls, db_model: ModelType | Row) -> SchemaReturnType:
         return cls.schema.model_validate(db_model)
 
+    @classmethod
+    def map_to_domain_entities(
+        cls,
+        db_models: Iterable[ModelType | Row],
+        trusted: bool | None = None,
+    ) -> list[SchemaReturnType]:
+        if trusted is None:
+            trusted = settings.db.trusted_mapping
+        if trusted:
+            return construct_trusted(cls.schema, db_models)
+        items = [item._asdict() if isinstance(item, Row) else item for item in db_models]
+        return get_list_adapter(cls.schema).validate_python(items, from_attributes=True)
+
     @classmethod
     def map_to_persistence_entity(cls, schema: SchemaReturnType) -> ModelType:
         return cls.model(**schema.model_dump())
@@ -1,10 +1,204 @@
+from typing import Mapping
+
+from asyncpg import CheckViolationError, DataError
+from sqlalchemy import Integer, Result, any_, bindparam, cast, column, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import DBAPIError, IntegrityError
+
 from src.models.product import Product
 from src.repos.base import BaseRepo
+from src.repos.mappers.base import get_list_adapter
 from src.repos.mappers.mappers import ProductMapper
-from src.schemas.product import ProductAddDTO, ProductDTO, ProductUpdateDTO
+from src.schemas.product import (
+    ProductAddDTO,
+    ProductDTO,
+    ProductFilterDTO,
+    ProductSearchHitDTO,
+    ProductSimilarityDTO,
+    ProductUpdateDTO,
+    StockAdjustmentDTO,
+    StockAdjustmentStatus,
+)
+from src.utils.exceptions import InsufficientStockError, InvalidPageSizeError, ObjectNotFoundError, ValueOutOfRangeError
+from src.utils.limits import INT4_MAX, INT4_MIN
+from src.utils.pagination import decode_cursor, encode_cursor
+
+SEARCH_CONFIG = "russian"
 
 
 class ProductRepo(BaseRepo[Product, ProductDTO, ProductAddDTO, ProductUpdateDTO]):
     model = Product
     schema = ProductDTO
     mapper = ProductMapper
+    conflict_fields = ("title",)
+    sort_fields = ("id", "title", "price", "created_at", "updated_at")
+    similarity_schema = ProductSimilarityDTO
+
+    @staticmethod
+    def _filter_clauses(filters: ProductFilterDTO | None) -> list:
+        if filters is None:
+            return []
+        clauses = []
+        if filters.price_min is not None:
+            clauses.append(Product.price >= filters.price_min)
+        if filters.price_max is not None:
+            clauses.append(Product.price <= filters.price_max)
+        if filters.in_stock is not None:
+            clauses.append(Product.quantity > 0 if filters.in_stock else Product.quantity == 0)
+        if filters.category_ids is not None:
+            clauses.append(Product.category_id.in_(filters.category_ids))
+        if filters.title_prefix is not None:
+            # the pattern is built here rather than in SQL so the planner sees a constant prefix
+            # and can use the text_pattern_ops index
+            prefix = filters.title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append(Product.title.like(f"{prefix}%", escape="\\"))
+        return clauses
+
+    async def get_filtered(
+        self,
+        filters: ProductFilterDTO | None = None,
+        sort_by: str = "id",
+        descending: bool = False,
+        offset: int | None = None,
+        limit: int | None = None,
+    ) -> list[ProductDTO]:
+        return await self.get_all_filtered(
+            *self._filter_clauses(filters),
+            sort_by=sort_by,
+            descending=descending,
+            offset=offset,
+            limit=limit,
+        )
+
+    async def get_filtered_page(
+        self,
+        filters: ProductFilterDTO | None = None,
+        cursor: str | None = None,
+        limit: int = 50,
+        sort_by: str = "id",
+        descending: bool = False,
+    ) -> tuple[list[ProductDTO], str | None]:
+        return await self.get_page(
+            *self._filter_clauses(filters),
+            cursor=cursor,
+            limit=limit,
+            sort_by=sort_by,
+            descending=descending,
+        )
+
+    async def search(
+        self,
+        text: str,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> tuple[list[ProductSearchHitDTO], str | None]:
+        if limit < 1:
+            raise InvalidPageSizeError
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+        rank = func.ts_rank(Product.search_vector, ts_query)
+        query = select(*self.read_columns, rank.label("rank")).where(Product.search_vector.bool_op("@@")(ts_query))
+        if cursor is not None:
+            last_rank, last_id = decode_cursor(cursor, "rank", float)
+            query = query.where(self._keyset_clause(rank, Product.id, last_rank, last_id, descending=True))
+        query = query.order_by(rank.desc(), Product.id.desc()).limit(limit + 1)
+        try:
+            result = await self.session.execute(query)
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            raise exc
+
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("rank", rows[-1].rank, rows[-1].id)
+        return get_list_adapter(ProductSearchHitDTO).validate_python([row._asdict() for row in rows]), next_cursor
+
+    async def adjust_quantity(self, id: int, delta: int) -> int:
+        # the guard makes concurrent adjustments queue on the row lock and re-check against the committed quantity,
+        # so there is no read-modify-write window to lose updates in
+        if not INT4_MIN <= id <= INT4_MAX:
+            # no such row can exist, same as adjust_quantities reports it
+            raise ObjectNotFoundError
+        stmt = (
+            update(Product)
+            .where(Product.id == id, Product.quantity + delta >= 0)
+            .values(quantity=Product.quantity + delta)
+            .returning(Product.quantity)
+        )
+        quantity = (await self._execute_adjustment(stmt)).scalar_one_or_none()
+        if quantity is None:
+            if await self.session.scalar(select(Product.id).where(Product.id == id)) is None:
+                raise ObjectNotFoundError
+            raise InsufficientStockError
+        self._track_write([id])
+        return quantity
+
+    async def adjust_quantities(self, deltas: Mapping[int, int]) -> list[StockAdjustmentDTO]:
+        ids = [id for id in deltas if INT4_MIN <= id <= INT4_MAX]
+        applied: dict[int, int] = {}
+        current: dict[int, int] = {}
+        if ids:
+            change = (
+                func.unnest(
+                    cast(bindparam("ids", ids), ARRAY(Integer)),
+                    cast(bindparam("deltas", [deltas[id] for id in ids]), ARRAY(Integer)),
+                )
+                .table_valued(column("id", Integer), column("delta", Integer))
+                .render_derived(name="change")
+            )
+            # rows are locked in id order so that overlapping batches can't deadlock each other
+            locked = (
+                select(Product.id)
+                .where(Product.id == any_(cast(bindparam("locked_ids", ids), ARRAY(Integer))))
+                .order_by(Product.id)
+                .with_for_update()
+                .cte("locked")
+            )
+            stmt = (
+                update(Product)
+                .where(Product.id == change.c.id, Product.id == locked.c.id, Product.quantity + change.c.delta >= 0)
+                .values(quantity=Product.quantity + change.c.delta)
+                .returning(Product.id, Product.quantity)
+            )
+            applied = {row.id: row.quantity for row in await self._execute_adjustment(stmt)}
+            rejected = [id for id in ids if id not in applied]
+            if rejected:
+                query = select(Product.id, Product.quantity).where(
+                    Product.id == any_(cast(bindparam("ids", rejected), ARRAY(Integer)))
+                )
+                current = {row.id: row.quantity for row in await self.session.execute(query)}
+            self._track_write(applied)
+
+        results = []
+        for id in deltas:
+            if id in applied:
+                results.append(StockAdjustmentDTO(id=id, status=StockAdjustmentStatus.APPLIED, quantity=applied[id]))
+            elif id in current:
+                results.append(StockAdjustmentDTO(id=id, status=StockAdjustmentStatus.INSUFFICIENT, quantity=current[id]))
+            else:
+                results.append(StockAdjustmentDTO(id=id, status=StockAdjustmentStatus.NOT_FOUND))
+        return results
+
+    async def lock_quantities(self, ids: list[int]) -> dict[int, int]:
+        query = (
+            select(Product.id, Product.quantity)
+            .where(Product.id == any_(cast(bindparam("ids", ids), ARRAY(Integer))))
+            .order_by(Product.id)
+            .with_for_update()
+        )
+        return {row.id: row.quantity for row in await self.session.execute(query)}
+
+    async def _execute_adjustment(self, stmt) -> Result:
+        try:
+            return await self.session.execute(stmt)
+        except IntegrityError as exc:
+            # quantity_positive backs the guard up
+            if exc.orig and isinstance(exc.orig.__cause__, CheckViolationError):
+                raise InsufficientStockError from exc
+            raise exc
+        except DBAPIError as exc:
+            if exc.orig and isinstance(exc.orig.__cause__, DataError):
+                raise ValueOutOfRangeError(detail=exc.orig.__cause__.args[0]) from exc
+            raise exc
@@ -1,9 +1,18 @@
+from enum import StrEnum
+
 from pydantic import Field
 
 from src.schemas.base import BaseDTO, TimingDTO
 from src.schemas.product import ProductDTO
 
 
+class CategoryProductsLoad(StrEnum):
+    NONE = "none"
+    COUNT = "count"
+    FIRST = "first"
+    FULL = "full"
+
+
 class CategoryUpdateDTO(BaseDTO):
     title: str | None = Field(None, min_length=1, max_length=100)
     description: str | None = Field(None, min_length=1, max_length=5000)
@@ -20,3 +29,11 @@ class CategoryDTO(CategoryAddDTO, TimingDTO):
 
 class CategoryWithProductsDTO(CategoryDTO):
     products: list[ProductDTO]
+
+
+class CategorySummaryDTO(CategoryDTO):
+    products_count: int = Field(..., ge=0)
+
+
+class CategorySimilarityDTO(CategoryDTO):
+    similarity: float = Field(..., ge=0, le=1)
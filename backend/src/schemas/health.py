@@ -0,0 +1,28 @@
+from pydantic import Field
+
+from src.schemas.base import BaseDTO
+
+
+class PoolStatsDTO(BaseDTO):
+    pid: int
+    size: int = Field(..., ge=0)
+    checked_out: int = Field(..., ge=0)
+    idle: int = Field(..., ge=0)
+    overflow: int = Field(..., ge=0)
+    max_overflow: int
+    checkouts: int = Field(..., ge=0)
+    timeouts: int = Field(..., ge=0)
+    wait_total: float = Field(..., ge=0)
+    wait_max: float = Field(..., ge=0)
+    wait_avg: float = Field(..., ge=0)
+
+
+class IndexReportDTO(BaseDTO):
+    unindexed_foreign_keys: list[str] = Field(default_factory=list)
+    unused_indexes: list[str] = Field(default_factory=list)
+    duplicate_indexes: list[list[str]] = Field(default_factory=list)
+    seq_scan_tables: dict[str, float] = Field(default_factory=dict)
+
+    @property
+    def has_findings(self) -> bool:
+        return bool(self.unindexed_foreign_keys or self.unused_indexes or self.duplicate_indexes or self.seq_scan_tables)
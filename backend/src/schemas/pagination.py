@@ -0,0 +1,17 @@
+from typing import Generic, TypeVar
+
+from pydantic import Field
+
+from src.schemas.base import BaseDTO
+
+ItemType = TypeVar("ItemType", bound=BaseDTO)
+
+
+class CursorPageDTO(BaseDTO, Generic[ItemType]):
+    items: list[ItemType]
+    next_cursor: str | None = None
+
+
+class MultiGetDTO(BaseDTO, Generic[ItemType]):
+    items: list[ItemType]
+    missing: list[int] = Field(default_factory=list)
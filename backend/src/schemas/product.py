@@ -1,4 +1,7 @@
-from pydantic import Field
+from enum import StrEnum
+from typing import Annotated
+
+from pydantic import Field, model_validator
 
 from src.schemas.base import BaseDTO, TimingDTO
 
@@ -21,3 +24,53 @@ class ProductAddDTO(BaseDTO):
 
 class ProductDTO(ProductAddDTO, TimingDTO):
     id: int
+
+
+class ProductSearchHitDTO(ProductDTO):
+    rank: float
+
+
+class ProductSimilarityDTO(ProductDTO):
+    similarity: float = Field(..., ge=0, le=1)
+
+
+class ProductSortField(StrEnum):
+    ID = "id"
+    TITLE = "title"
+    PRICE = "price"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+class ProductFilterDTO(BaseDTO):
+    price_min: float | None = Field(None, ge=0)
+    price_max: float | None = Field(None, ge=0)
+    in_stock: bool | None = None
+    category_ids: list[Annotated[int, Field(ge=1, le=2**31 - 1)]] | None = Field(None, min_length=1, max_length=100)
+    title_prefix: str | None = Field(None, min_length=1, max_length=100)
+
+    @model_validator(mode="after")
+    def check_price_range(self) -> "ProductFilterDTO":
+        if self.price_min is not None and self.price_max is not None and self.price_min > self.price_max:
+            raise ValueError("price_min must not be greater than price_max")
+        return self
+
+
+class ProductListQueryDTO(ProductFilterDTO):
+    sort_by: ProductSortField = ProductSortField.ID
+    descending: bool = False
+    cursor: str | None = None
+    limit: int = Field(50, ge=1, le=100)
+
+
+class StockAdjustmentStatus(StrEnum):
+    APPLIED = "applied"
+    INSUFFICIENT = "insufficient"
+    NOT_FOUND = "not_found"
+
+
+class StockAdjustmentDTO(BaseDTO):
+    id: int
+    status: StockAdjustmentStatus
+    # the new quantity when applied, the untouched one when stock was insufficient
+    quantity: int | None = None
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from pydantic import Field
+
+from src.schemas.base import BaseDTO
+
+
+class VersionDTO(BaseDTO):
+    last_modified: datetime | None = None
+    # bumped by every committed write to the tables the version covers
+    version: int = Field(0, ge=0)
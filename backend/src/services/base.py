@@ -1,3 +1,8 @@
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+from src.cache import catalog_cache
+from src.config import settings
+from src.utils.cache import Dependency
 from src.utils.db_tools import DBManager
 
 
@@ -5,3 +10,10 @@ class BaseService:
     def __init__(self, db_manager: DBManager | None) -> None:
         if db_manager is not None:
             self.db = db_manager
+
+    async def _cached(self, key: Hashable, depends_on: Iterable[Dependency], loader: Callable[[], Awaitable[Any]]) -> Any:
+        # uncommitted writes of this session must stay visible to its own reads;
+        # loaders read the primary, a lagging replica could pin pre-commit data for a whole TTL
+        if not settings.cache.enabled or self.db.has_pending_writes:
+            return await loader()
+        return await catalog_cache.get_or_load(key, loader, depends_on)
@@ -1,6 +1,14 @@
-from src.schemas.category import CategoryAddDTO, CategoryDTO, CategoryUpdateDTO, CategoryWithProductsDTO
+from src.schemas.category import (
+    CategoryAddDTO,
+    CategoryDTO,
+    CategoryProductsLoad,
+    CategorySimilarityDTO,
+    CategoryUpdateDTO,
+)
+from src.schemas.pagination import CursorPageDTO, MultiGetDTO
+from src.schemas.version import VersionDTO
 from src.services.base import BaseService
-from src.services.product import ProductService
+from src.utils.cache import Dependency
 from src.utils.exceptions import (
     CategoryAlreadyExistsError,
     CategoryInvalidValueError,
@@ -14,15 +22,67 @@ from src.utils.exceptions import (
 
 
 class CategoryService(BaseService):
-    async def get_categories(self) -> list[CategoryWithProductsDTO]:
-        return await self.db.category.get_all()  # type: ignore
+    @staticmethod
+    def _catalog_dependencies(products: CategoryProductsLoad, id: int | None = None) -> list[Dependency]:
+        dependencies: list[Dependency] = [("categories", id)]
+        if products != CategoryProductsLoad.NONE:
+            dependencies.append(("products", None))
+        return dependencies
+
+    async def get_categories(
+        self,
+        products: CategoryProductsLoad = CategoryProductsLoad.FULL,
+        products_limit: int = 10,
+        version: int | None = None,
+    ) -> list[CategoryDTO]:
+        # keyed by the version the caller validated against: once the replica shows a newer one, an entry
+        # whose invalidation has not arrived yet is simply not found, instead of going out under the new ETag
+        return await self._cached(
+            ("categories", products, products_limit, version),
+            self._catalog_dependencies(products),
+            lambda: self.db.category.get_all_filtered(products=products, products_limit=products_limit),
+        )
+
+    async def get_categories_version(self, products: CategoryProductsLoad = CategoryProductsLoad.FULL) -> VersionDTO:
+        return await self.db.read.category.get_version(products=products)
+
+    async def get_categories_page(
+        self,
+        cursor: str | None = None,
+        limit: int = 50,
+        sort_by: str = "id",
+        descending: bool = False,
+    ) -> CursorPageDTO[CategoryDTO]:
+        items, next_cursor = await self.db.read.category.get_page(
+            cursor=cursor,
+            limit=limit,
+            sort_by=sort_by,
+            descending=descending,
+        )
+        return CursorPageDTO[CategoryDTO](items=items, next_cursor=next_cursor)
 
-    async def get_category(self, id: int) -> CategoryWithProductsDTO:
-        result = await self.db.category.get_all_filtered(id=id)
+    async def get_similar_categories(self, text: str, limit: int = 10, threshold: float = 0.3) -> list[CategorySimilarityDTO]:
+        return await self.db.read.category.get_similar(text, limit=limit, threshold=threshold)  # type: ignore
+
+    async def get_category(
+        self,
+        id: int,
+        products: CategoryProductsLoad = CategoryProductsLoad.FULL,
+        products_limit: int = 10,
+    ) -> CategoryDTO:
+        result = await self._cached(
+            ("category", id, products, products_limit),
+            self._catalog_dependencies(products, id=id),
+            lambda: self.db.category.get_all_filtered(id=id, products=products, products_limit=products_limit),
+        )
         if not result:
             raise CategoryNotFoundError
         return result[0]
 
+    async def get_categories_by_ids(self, ids: list[int]) -> MultiGetDTO[CategoryDTO]:
+        items, missing = await self.db.read.category.get_many(ids)
+        return MultiGetDTO[CategoryDTO](items=items, missing=missing)
+
     async def add_category(self, data: CategoryAddDTO) -> CategoryDTO:
         try:
             return await self.db.category.add(data)
@@ -39,10 +99,27 @@ class CategoryService(BaseService):
         except ObjectInvalidValueError as exc:
             raise CategoryInvalidValueError from exc
 
+    async def upsert_categories(
+        self,
+        data: list[CategoryAddDTO],
+        update_fields: list[str] | None = None,
+    ) -> list[tuple[bool, CategoryDTO]]:
+        try:
+            return await self.db.category.upsert_bulk(data, update_fields=update_fields)
+        except ObjectInvalidValueError as exc:
+            raise CategoryInvalidValueError from exc
+
+    async def import_categories(self, data: list[CategoryAddDTO], chunk_size: int = 10_000) -> int:
+        try:
+            return await self.db.category.copy_bulk(data, chunk_size=chunk_size)
+        except ObjectAlreadyExistsError as exc:
+            raise CategoryAlreadyExistsError from exc
+        except ObjectInvalidValueError as exc:
+            raise CategoryInvalidValueError from exc
+
     async def update_category(self, id: int, data: CategoryUpdateDTO) -> CategoryDTO:
         try:
-            await self.db.category.edit(id=id, data=data)  # type: ignore
-            return await self.db.category.get_one(id=id)
+            return await self.db.category.edit_returning(id=id, data=data)  # type: ignore
         except ObjectNotFoundError as exc:
             raise CategoryNotFoundError from exc
         except ObjectAlreadyExistsError as exc:
@@ -52,11 +129,7 @@ class CategoryService(BaseService):
 
     async def delete_category(self, id: int) -> bool:
         try:
-            await self.get_category(id=id)
-            products = await ProductService(self.db).get_products_by_category(id=id)
-            if products:
-                raise RelatedProductsExistsError
-            return await self.db.category.delete(id=id, ensure_existence=False)
+            return await self.db.category.delete_without_products(id=id)
         except RelatedObjectExistsError as exc:
             raise RelatedProductsExistsError from exc
         except ObjectNotFoundError as exc:
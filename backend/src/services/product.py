@@ -1,4 +1,18 @@
-from src.schemas.product import ProductAddDTO, ProductDTO, ProductUpdateDTO
+from typing import AsyncIterator
+
+from src.config import settings
+from src.schemas.pagination import CursorPageDTO, MultiGetDTO
+from src.schemas.product import (
+    ProductAddDTO,
+    ProductDTO,
+    ProductFilterDTO,
+    ProductSearchHitDTO,
+    ProductSimilarityDTO,
+    ProductSortField,
+    ProductUpdateDTO,
+    StockAdjustmentDTO,
+)
+from src.schemas.version import VersionDTO
 from src.services.base import BaseService
 from src.utils.exceptions import (
     CategoryNotFoundError,
@@ -9,17 +23,70 @@ from src.utils.exceptions import (
     ProductInvalidValueError,
     ProductNotFoundError,
 )
+from src.utils.export import ExportFormat, serialize_csv, serialize_ndjson
+from src.utils.stock_buffer import get_stock_buffer
 
 
 class ProductService(BaseService):
-    async def get_products(self) -> list[ProductDTO]:
-        return await self.db.product.get_all_filtered()
+    async def get_products(
+        self,
+        filters: ProductFilterDTO | None = None,
+        sort_by: ProductSortField = ProductSortField.ID,
+        descending: bool = False,
+    ) -> list[ProductDTO]:
+        return await self.db.read.product.get_filtered(filters, sort_by=sort_by, descending=descending)
+
+    async def get_products_version(self) -> VersionDTO:
+        return await self.db.read.product.get_version()
+
+    async def export_products(self, format: ExportFormat, batch_size: int = 1000) -> AsyncIterator[bytes]:
+        if format == ExportFormat.CSV:
+            yield serialize_csv([], fields=list(ProductDTO.model_fields))
+        async for batch in self.db.read.product.stream_all(batch_size=batch_size):
+            if format == ExportFormat.CSV:
+                yield serialize_csv(batch)
+            else:
+                yield serialize_ndjson(batch)
+
+    async def get_products_page(
+        self,
+        cursor: str | None = None,
+        limit: int = 50,
+        sort_by: str = "id",
+        descending: bool = False,
+        filters: ProductFilterDTO | None = None,
+    ) -> CursorPageDTO[ProductDTO]:
+        items, next_cursor = await self.db.read.product.get_filtered_page(
+            filters,
+            cursor=cursor,
+            limit=limit,
+            sort_by=sort_by,
+            descending=descending,
+        )
+        return CursorPageDTO[ProductDTO](items=items, next_cursor=next_cursor)
+
+    async def search_products(
+        self,
+        text: str,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> CursorPageDTO[ProductSearchHitDTO]:
+        items, next_cursor = await self.db.read.product.search(text, cursor=cursor, limit=limit)
+        return CursorPageDTO[ProductSearchHitDTO](items=items, next_cursor=next_cursor)
+
+    async def get_similar_products(self, text: str, limit: int = 10, threshold: float = 0.3) -> list[ProductSimilarityDTO]:
+        return await self.db.read.product.get_similar(text, limit=limit, threshold=threshold)  # type: ignore
 
     async def get_product(self, id: int) -> ProductDTO:
-        result = await self.db.product.get_all_filtered(id=id)
-        if not result:
+        batched = self.db.batched
+        if batched is not None:
+            product = await batched.product.load(id)
+        else:
+            result = await self.db.read.product.get_all_filtered(id=id)
+            product = result[0] if result else None
+        if product is None:
             raise ProductNotFoundError
-        return result[0]
+        return product
 
     async def add_product(self, data: ProductAddDTO) -> ProductDTO:
         try:
@@ -39,10 +106,31 @@ class ProductService(BaseService):
         except ObjectInvalidValueError as exc:
             raise ProductInvalidValueError from exc
 
+    async def upsert_products(
+        self,
+        data: list[ProductAddDTO],
+        update_fields: list[str] | None = None,
+    ) -> list[tuple[bool, ProductDTO]]:
+        try:
+            return await self.db.product.upsert_bulk(data, update_fields=update_fields)
+        except ObjectInvalidValueError as exc:
+            raise ProductInvalidValueError from exc
+        except ObjectNotFoundError as exc:
+            raise CategoryNotFoundError from exc
+
+    async def import_products(self, data: list[ProductAddDTO], chunk_size: int = 10_000) -> int:
+        try:
+            return await self.db.product.copy_bulk(data, chunk_size=chunk_size)
+        except ObjectAlreadyExistsError as exc:
+            raise ProductAlreadyExistsError from exc
+        except ObjectInvalidValueError as exc:
+            raise ProductInvalidValueError from exc
+        except ObjectNotFoundError as exc:
+            raise CategoryNotFoundError from exc
+
     async def update_product(self, id: int, data: ProductUpdateDTO) -> ProductDTO:
         try:
-            await self.db.product.edit(id=id, data=data)  # type: ignore
-            return await self.db.product.get_one(id=id)
+            return await self.db.product.edit_returning(id=id, data=data)  # type: ignore
         except ObjectNotFoundError as exc:
             raise ProductNotFoundError from exc
         except ObjectAlreadyExistsError as exc:
@@ -50,9 +138,37 @@ class ProductService(BaseService):
         except ObjectInvalidValueError as exc:
             raise ProductInvalidValueError from exc
 
+    async def get_products_by_ids(self, ids: list[int]) -> MultiGetDTO[ProductDTO]:
+        items, missing = await self.db.read.product.get_many(ids)
+        return MultiGetDTO[ProductDTO](items=items, missing=missing)
+
+    async def update_products(self, data: dict[int, ProductUpdateDTO], chunk_size: int = 5000) -> dict[int, bool]:
+        try:
+            return await self.db.product.edit_bulk(data, chunk_size=chunk_size)
+        except ObjectAlreadyExistsError as exc:
+            raise ProductAlreadyExistsError from exc
+        except ObjectInvalidValueError as exc:
+            raise ProductInvalidValueError from exc
+        except ObjectNotFoundError as exc:
+            raise CategoryNotFoundError from exc
+
+    async def adjust_stock(self, id: int, delta: int) -> int:
+        try:
+            return await self.db.product.adjust_quantity(id, delta)
+        except ObjectNotFoundError as exc:
+            raise ProductNotFoundError from exc
+
+    async def adjust_stocks(self, deltas: dict[int, int]) -> list[StockAdjustmentDTO]:
+        return await self.db.product.adjust_quantities(deltas)
+
+    async def adjust_stock_buffered(self, id: int, delta: int) -> StockAdjustmentDTO:
+        # with the buffer on, the delta is merged with others and committed by the buffer, outside of this unit of work
+        if not settings.stock_buffer.enabled:
+            return (await self.db.product.adjust_quantities({id: delta}))[0]
+        return await get_stock_buffer(self.db.session_factory).adjust(id, delta)
+
     async def get_products_by_category(self, id: int) -> list[ProductDTO]:
-        category = await self.db.category.get_all_filtered(id=id)
-        return category[0].products
+        return await self.db.read.product.get_all_filtered(category_id=id)
 
     async def delete_product(self, id: int) -> bool:
         try:
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Mapping, TypeVar
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.utils.exceptions import ApplicationError, ValueOutOfRangeError
+from src.utils.limits import INT4_MAX, INT4_MIN
+from src.utils.metrics import BATCH_SIZE
+
+T = TypeVar("T")
+
+# what a lookup query can fail with; each waiter gets the error as if it had run the query itself
+LOAD_ERRORS = (SQLAlchemyError, ApplicationError, OSError)
+
+
+class BatchLoader(Generic[T]):
+    def __init__(
+        self,
+        load_many: Callable[[list[int]], Awaitable[Mapping[int, T]]],
+        name: str,
+        window: float = 0.001,
+        max_batch_size: int = 1000,
+    ) -> None:
+        self.load_many = load_many
+        self.name = name
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: dict[int, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def load(self, id: int) -> T | None:
+        # one out of range id would fail the whole batch it lands in
+        if not INT4_MIN <= id <= INT4_MAX:
+            raise ValueOutOfRangeError(detail=f"value out of int32 range: {id}")
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._pending, self._timer, self._loop = {}, None, loop
+        future = loop.create_future()
+        self._pending.setdefault(id, []).append(future)
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: dict[int, list[asyncio.Future]]) -> None:
+        BATCH_SIZE.labels(self.name).observe(len(batch))
+        found: Mapping[int, T] | None = None
+        error: Exception | None = None
+        try:
+            found = await self.load_many(list(batch))
+        except LOAD_ERRORS as exc:
+            error = exc
+        finally:
+            for id, futures in batch.items():
+                for future in futures:
+                    if future.done():
+                        continue
+                    if found is not None:
+                        future.set_result(found.get(id))
+                    elif error is not None:
+                        future.set_exception(error)
+                    else:
+                        # a bug or a cancelled batch still must not leave its waiters hanging
+                        future.cancel()
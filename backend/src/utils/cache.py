@@ -0,0 +1,96 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Mapping
+
+# (table, id) pairs an entry was built from; id None means the entry depends on the whole table
+Dependency = tuple[str, int | None]
+
+
+class AsyncTTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any, frozenset[Dependency]]] = OrderedDict()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        depends_on: Iterable[Dependency],
+    ) -> Any:
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+            future = self._loading.get(key)
+            if future is None:
+                break
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # the loading request went away, so one of the waiters takes over
+                if future.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+        # anything invalidated while loading may already be baked into the value
+        if generation == self._generation:
+            self._set(key, value, frozenset(depends_on))
+        future.set_result(value)
+        return value
+
+    def _set(self, key: Hashable, value: Any, depends_on: frozenset[Dependency]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value, depends_on)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, table: str, ids: Iterable[int] | None = None) -> None:
+        self.invalidate_many({table: None if ids is None else set(ids)})
+
+    def invalidate_many(self, writes: Mapping[str, set[int] | None]) -> None:
+        self._generation += 1
+        self._loading.clear()
+        for key, (_, _, depends_on) in list(self._entries.items()):
+            for table, id in depends_on:
+                if table not in writes:
+                    continue
+                ids = writes[table]
+                if id is None or ids is None or id in ids:
+                    del self._entries[key]
+                    break
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._loading.clear()
+        self._entries.clear()
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import asyncpg
+import orjson
+
+from src.utils.cache import AsyncTTLCache
+
+logger = logging.getLogger(__name__)
+
+# anything else is a bug and should surface instead of being retried forever;
+# interface errors such as ConnectionDoesNotExistError are not PostgresErrors
+CONNECTION_ERRORS = (OSError, asyncpg.PostgresError, asyncpg.InterfaceError)
+
+# NOTIFY payloads are limited to 8000 bytes, bigger id sets invalidate the whole table
+MAX_PAYLOAD_SIZE = 7900
+
+
+def encode_invalidation(table: str, ids: set[int] | None) -> str:
+    payload = orjson.dumps({"table": table, "ids": sorted(ids) if ids is not None else None})
+    if len(payload) > MAX_PAYLOAD_SIZE:
+        payload = orjson.dumps({"table": table, "ids": None})
+    return payload.decode()
+
+
+def decode_invalidation(payload: str) -> tuple[str, set[int] | None]:
+    data = orjson.loads(payload)
+    ids = data.get("ids")
+    return data["table"], set(ids) if ids is not None else None
+
+
+class InvalidationListener:
+    def __init__(
+        self,
+        cache: AsyncTTLCache,
+        channel: str,
+        connect: Callable[[], Awaitable[asyncpg.Connection]],
+        min_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        self.cache = cache
+        self.channel = channel
+        self.connect = connect
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"listen:{self.channel}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        backoff = self.min_backoff
+        while True:
+            try:
+                conn = await self.connect()
+            except CONNECTION_ERRORS as exc:
+                logger.warning("Cache invalidation listener can't connect: %r, retrying in %.1fs", exc, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda *_, lost=lost: lost.set())
+            try:
+                await conn.add_listener(self.channel, self._on_notification)
+                # notifications sent while we were away are gone, entries only had the TTL to protect them
+                self.cache.clear()
+                self.connected.set()
+                backoff = self.min_backoff
+                logger.info("Listening for cache invalidations on %r", self.channel)
+                await lost.wait()
+                logger.warning("Cache invalidation listener lost its connection")
+            except CONNECTION_ERRORS as exc:
+                logger.warning("Cache invalidation listener failed: %r, reconnecting in %.1fs", exc, backoff)
+            finally:
+                self.connected.clear()
+                if not conn.is_closed():
+                    conn.terminate()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def _on_notification(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            table, ids = decode_invalidation(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Malformed cache invalidation payload: %r", payload)
+            self.cache.clear()
+            return
+        self.cache.invalidate(table, ids)
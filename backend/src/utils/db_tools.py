@@ -1,36 +1,131 @@
+import asyncio
 import logging
+from contextlib import AsyncExitStack
 from typing import Self
 
-from sqlalchemy import Connection, inspect
+from sqlalchemy import Connection, inspect, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from src.cache import catalog_cache
+from src.config import IndexAdvisorConfig, settings
 from src.models.base import Base
 from src.repos.category import CategoryRepo
 from src.repos.product import ProductRepo
-from src.utils.exceptions import MissingTablesError
+from src.schemas.health import IndexReportDTO
+from src.utils.cache_bus import encode_invalidation
+from src.utils.exceptions import IndexAdvisorError, MissingTablesError
 
 logger = logging.getLogger(__name__)
 
+# constraint-backing indexes are needed even when nothing reads through them
+UNUSED_INDEXES_SQL = text(
+    """
+    SELECT s.relname || '.' || s.indexrelname
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    JOIN pg_stat_user_tables t ON t.relid = s.relid
+    WHERE s.schemaname = current_schema() AND s.relname = ANY(:tables)
+      AND s.idx_scan = 0 AND NOT i.indisunique AND NOT i.indisprimary
+      AND t.seq_scan + coalesce(t.idx_scan, 0) >= :min_scans
+    ORDER BY 1
+    """
+)
+DUPLICATE_INDEXES_SQL = text(
+    """
+    SELECT array_agg(ci.relname::text ORDER BY ci.relname)
+    FROM pg_index i
+    JOIN pg_class ct ON ct.oid = i.indrelid
+    JOIN pg_class ci ON ci.oid = i.indexrelid
+    WHERE ct.relnamespace = current_schema()::regnamespace AND ct.relname = ANY(:tables)
+    GROUP BY i.indrelid, ci.relam, i.indkey::text, i.indclass::text,
+        coalesce(pg_get_expr(i.indexprs, i.indrelid), ''), coalesce(pg_get_expr(i.indpred, i.indrelid), '')
+    HAVING count(*) > 1
+    ORDER BY 1
+    """
+)
+SEQ_SCAN_TABLES_SQL = text(
+    """
+    SELECT relname, seq_scan::float / (seq_scan + coalesce(idx_scan, 0)) AS ratio
+    FROM pg_stat_user_tables
+    WHERE schemaname = current_schema() AND relname = ANY(:tables)
+      AND seq_scan + coalesce(idx_scan, 0) >= :min_scans AND n_live_tup >= :min_rows
+      AND seq_scan::float / (seq_scan + coalesce(idx_scan, 0)) > :ratio
+    ORDER BY relname
+    """
+)
+
+
+class ReplicaRepos:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.product = ProductRepo(session)
+        self.category = CategoryRepo(session)
+
+
+class BatchLoaders:
+    def __init__(self, session_factory: async_sessionmaker) -> None:
+        self.product = ProductRepo.batch_loader(session_factory)
+        self.category = CategoryRepo.batch_loader(session_factory)
+
 
 class DBManager:
-    def __init__(self, session_factory: async_sessionmaker) -> None:
+    def __init__(self, session_factory: async_sessionmaker, read_session_factory: async_sessionmaker | None = None) -> None:
         self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
 
     async def __aenter__(self) -> Self:
         self.session: AsyncSession = self.session_factory()
         self.product = ProductRepo(self.session)
         self.category = CategoryRepo(self.session)
+        self.replica: ReplicaRepos | None = None
+        self.wrote = False
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         await self.rollback()
         await self.session.close()
+        if self.replica is not None:
+            await self.replica.session.close()
+
+    @property
+    def has_pending_writes(self) -> bool:
+        return bool(self.session.info.get("writes"))
+
+    @property
+    def read(self) -> "DBManager | ReplicaRepos":
+        # once this unit of work has written, the replica may lag behind what it should see
+        if self.read_session_factory is None or self.wrote or self.has_pending_writes:
+            return self
+        if self.replica is None:
+            self.replica = ReplicaRepos(self.read_session_factory())
+        return self.replica
+
+    @property
+    def batched(self) -> BatchLoaders | None:
+        # batches run on sessions of their own and can't see what this unit of work has not committed yet
+        if not settings.db.batch_lookups or self.has_pending_writes:
+            return None
+        if self.read_session_factory is None or self.wrote:
+            return BatchLoaders(self.session_factory)
+        return BatchLoaders(self.read_session_factory)
 
     async def commit(self) -> None:
+        writes = self.session.info.pop("writes", None)
+        if writes and settings.cache.enabled:
+            # NOTIFY is transactional: other workers hear about the writes only once they are committed
+            for table, ids in writes.items():
+                await self.session.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": settings.cache.channel, "payload": encode_invalidation(table, ids)},
+                )
         await self.session.commit()
+        if writes:
+            self.wrote = True
+            catalog_cache.invalidate_many(writes)
 
     async def rollback(self) -> None:
         await self.session.rollback()
+        self.session.info.pop("writes", None)
 
 
 class DBHealthChecker:
@@ -40,12 +135,72 @@ class DBHealthChecker:
     async def dispose(self) -> None:
         await self.engine.dispose()
 
+    async def warm_up(self, size: int) -> None:
+        # open the connections up front so the first requests don't pay for connect and auth
+        async with AsyncExitStack() as stack:
+            connections = [stack.enter_async_context(self.engine.connect()) for _ in range(size)]
+            await asyncio.gather(*connections)
+        logger.info("Pool warmed up with %d connections", size)
+
     async def check(self):
         async with self.engine.connect() as conn:
             is_exists, missing = await conn.run_sync(self._check_tables_existence)
             if not is_exists:
                 raise MissingTablesError(detail=missing)
 
+    async def check_indexes(self, config: IndexAdvisorConfig) -> IndexReportDTO:
+        tables = list(Base.metadata.tables)
+        async with self.engine.connect() as conn:
+            unindexed_foreign_keys = await conn.run_sync(self._find_unindexed_foreign_keys)
+            unused = await conn.scalars(UNUSED_INDEXES_SQL, {"tables": tables, "min_scans": config.min_scans})
+            duplicates = await conn.scalars(DUPLICATE_INDEXES_SQL, {"tables": tables})
+            seq_scans = await conn.execute(
+                SEQ_SCAN_TABLES_SQL,
+                {
+                    "tables": tables,
+                    "min_scans": config.min_scans,
+                    "min_rows": config.min_rows,
+                    "ratio": config.seq_scan_ratio,
+                },
+            )
+            report = IndexReportDTO(
+                unindexed_foreign_keys=unindexed_foreign_keys,
+                unused_indexes=list(unused),
+                duplicate_indexes=list(duplicates),
+                seq_scan_tables={row.relname: row.ratio for row in seq_scans},
+            )
+
+        logger.info("Checking indexes...")
+        for column in report.unindexed_foreign_keys:
+            logger.warning("(-) Foreign key %s has no covering index", column)
+        for index in report.unused_indexes:
+            logger.warning("(-) Index %s has never been scanned", index)
+        for indexes in report.duplicate_indexes:
+            logger.warning("(-) Indexes %s are duplicates", ", ".join(indexes))
+        for table, ratio in report.seq_scan_tables.items():
+            logger.warning("(-) Table '%s' is read by sequential scans %.0f%% of the time", table, ratio * 100)
+
+        if config.strict and report.has_findings:
+            raise IndexAdvisorError(detail=f"{IndexAdvisorError.detail}: {report.model_dump_json()}")
+        return report
+
+    def _find_unindexed_foreign_keys(self, conn: Connection) -> list[str]:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        unindexed = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            # any index (or key) whose leading columns are the foreign key columns can serve lookups by them
+            leading_columns = [index["column_names"] for index in inspector.get_indexes(table.name)]
+            leading_columns.append(inspector.get_pk_constraint(table.name)["constrained_columns"])
+            leading_columns.extend(constraint["column_names"] for constraint in inspector.get_unique_constraints(table.name))
+            for foreign_key in table.foreign_key_constraints:
+                columns = [column.name for column in foreign_key.columns]
+                if not any(list(index_columns[: len(columns)]) == columns for index_columns in leading_columns):
+                    unindexed.append(f"{table.name}.{', '.join(columns)}")
+        return unindexed
+
     def _check_tables_existence(self, conn: Connection) -> tuple[bool, set[str]]:
         inspector = inspect(conn)
         existing_tables = set(inspector.get_table_names())
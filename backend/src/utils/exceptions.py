@@ -19,6 +19,10 @@ class MissingTablesError(ApplicationError):
         super().__init__(self.detail)
 
 
+class IndexAdvisorError(ApplicationError):
+    detail = "Index advisor found problems"
+
+
 class ObjectNotFoundError(ApplicationError):
     detail = "Object not found"
 
@@ -39,6 +43,22 @@ class ValueOutOfRangeError(ApplicationError):
     detail = "Value out of integer range"
 
 
+class InvalidPageRequestError(ApplicationError):
+    detail = "Invalid page request"
+
+
+class InvalidCursorError(InvalidPageRequestError):
+    detail = "Invalid pagination cursor"
+
+
+class InvalidSortFieldError(InvalidPageRequestError):
+    detail = "Unsupported sort field"
+
+
+class InvalidPageSizeError(InvalidPageRequestError):
+    detail = "Page size must be at least 1"
+
+
 class CategoryNotFoundError(ObjectNotFoundError):
     detail = "Category not found"
 
@@ -67,6 +87,10 @@ class ProductInvalidValueError(ObjectInvalidValueError):
     detail = "Product has invalid value"
 
 
+class InsufficientStockError(ApplicationError):
+    detail = "Insufficient stock"
+
+
 class ApplicationHTTPError(HTTPException):
     detail = "Something went wrong"
     status = status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -75,3 +99,8 @@ class ApplicationHTTPError(HTTPException):
         if detail is not None:
             self.detail = detail
         super().__init__(detail=self.detail, status_code=self.status)
+
+
+class InvalidPageRequestHTTPError(ApplicationHTTPError):
+    detail = "Invalid page request"
+    status = status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,32 @@
+import csv
+import io
+from enum import StrEnum
+from typing import Sequence
+
+import orjson
+from pydantic import BaseModel
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self is ExportFormat.CSV:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+def serialize_ndjson(items: Sequence[BaseModel]) -> bytes:
+    return b"".join(orjson.dumps(item.model_dump()) + b"\n" for item in items)
+
+
+def serialize_csv(items: Sequence[BaseModel], fields: Sequence[str] | None = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fields is not None:
+        writer.writerow(fields)
+    for item in items:
+        writer.writerow(item.model_dump(mode="json").values())
+    return buffer.getvalue().encode()
@@ -0,0 +1,2 @@
+# bounds of Postgres integer (int4) columns, a value outside them fails the whole statement
+INT4_MIN, INT4_MAX = -(2**31), 2**31 - 1
@@ -0,0 +1,121 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Histogram, generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.tracing import repo_method
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency",
+    ["repo_method"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Rows returned or affected by a database statement",
+    ["repo_method"],
+    buckets=(0, 1, 10, 50, 100, 500, 1000, 5000, 10_000, 50_000, 100_000),
+)
+SERIALIZATION_LATENCY = Histogram(
+    "response_serialization_seconds",
+    "Time spent rendering response bodies",
+    ["route"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+BATCH_SIZE = Histogram(
+    "db_batch_size",
+    "Distinct ids resolved by one batched lookup",
+    ["loader"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+STOCK_FLUSH_LATENCY = Histogram(
+    "stock_buffer_flush_seconds",
+    "Time to apply and commit one flush of buffered stock deltas",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+# the ASGI scope of the request being handled; the router fills in "route" once it has matched
+current_scope: ContextVar[Scope | None] = ContextVar("current_scope", default=None)
+
+
+def route_label(scope: Scope | None) -> str:
+    route = scope.get("route") if scope is not None else None
+    # unmatched paths are collapsed so that random urls can't blow up the label set
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = current_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(scope["method"], route_label(scope), str(status)).observe(time.perf_counter() - start)
+            current_scope.reset(token)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        start = time.perf_counter()
+        body = super().render(content)
+        SERIALIZATION_LATENCY.labels(route_label(current_scope.get())).observe(time.perf_counter() - start)
+        return body
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def observe_query(conn, cursor, statement, parameters, context, executemany) -> None:
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        method = repo_method.get()
+        QUERY_LATENCY.labels(method).observe(duration)
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            QUERY_ROWS.labels(method).observe(cursor.rowcount)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def drop_timer(context) -> None:
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,35 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+from src.utils.exceptions import InvalidCursorError
+from src.utils.limits import INT4_MAX, INT4_MIN
+
+
+def encode_cursor(sort_by: str, sort_value: Any, last_id: int) -> str:
+    payload = orjson.dumps([sort_by, sort_value, last_id])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_type: type) -> tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, sort_value, last_id = orjson.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError from exc
+
+    if cursor_sort_by != sort_by or not isinstance(last_id, int) or not INT4_MIN <= last_id <= INT4_MAX:
+        raise InvalidCursorError
+    try:
+        if sort_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif sort_type is float and isinstance(sort_value, int):
+            sort_value = float(sort_value)
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError from exc
+    if not isinstance(sort_value, sort_type) or (sort_type is int and not INT4_MIN <= sort_value <= INT4_MAX):
+        raise InvalidCursorError
+    return sort_value, last_id
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from typing import Any, Sequence
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.utils.tracing import repo_method
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_RE = re.compile(r"\s+")
+PARAM_LIST_RE = re.compile(r"\$\d+(?:::\w+)?(?:\s*,\s*\$\d+(?:::\w+)?)+")
+EXPLAINABLE = ("SELECT", "WITH")
+# data-modifying CTEs and row locks can't run in the read only transaction plans are captured in
+WRITES_RE = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(?:KEY\s+)?SHARE\b", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    statement = WHITESPACE_RE.sub(" ", statement).strip()
+    # bulk statements differ only in the number of placeholders
+    return PARAM_LIST_RE.sub("$n, ...", statement)
+
+
+def is_explainable(statement: str) -> bool:
+    return statement.lstrip()[:6].upper().startswith(EXPLAINABLE) and WRITES_RE.search(statement) is None
+
+
+def redact_params(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: redact_params(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return [redact_params(parameters[0]), f"... {len(parameters)} rows"]
+        return [redact_value(value) for value in parameters]
+    return redact_value(parameters)
+
+
+def redact_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold: float,
+        explain_engine: AsyncEngine,
+        sample_rate: float = 0.0,
+        max_concurrency: int = 2,
+        max_pending: int = 16,
+        explain_timeout: float = 30.0,
+    ) -> None:
+        self.threshold = threshold
+        self.explain_engine = explain_engine
+        self.sample_rate = sample_rate
+        self.max_pending = max_pending
+        self.explain_timeout = explain_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: set[asyncio.Task] = set()
+
+    def attach(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._start_timer)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._check_duration)
+
+    def detach(self, engine: AsyncEngine) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._start_timer)
+        event.remove(engine.sync_engine, "after_cursor_execute", self._check_duration)
+
+    async def drain(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def _start_timer(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context.slow_query_start = time.perf_counter()
+
+    def _check_duration(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        start = getattr(context, "slow_query_start", None)
+        if start is None or context.execution_options.get("skip_slow_query_log"):
+            return
+        duration = time.perf_counter() - start
+        if duration < self.threshold:
+            return
+
+        method = repo_method.get()
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s | params=%s",
+            duration * 1000,
+            method,
+            normalize_sql(statement),
+            orjson.dumps(redact_params(parameters)).decode(),
+        )
+        if executemany or not is_explainable(statement):
+            return
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return
+        if len(self._pending) >= self.max_pending:
+            return
+        task = asyncio.get_running_loop().create_task(self._explain(statement, parameters, method))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _explain(self, statement: str, parameters: Sequence[Any] | None, method: str) -> None:
+        async with self._semaphore:
+            try:
+                async with self.explain_engine.connect() as conn:
+                    conn = await conn.execution_options(skip_slow_query_log=True)
+                    # ANALYZE runs the statement for real, so keep it read only and throw the transaction away
+                    await conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                    await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(self.explain_timeout * 1000)}")
+                    result = await conn.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                        tuple(parameters or ()),
+                    )
+                    plan = result.scalar_one()
+                    await conn.rollback()
+            except Exception:
+                logger.exception("Failed to capture a plan for a slow query in %s", method)
+                return
+        logger.warning("Plan of slow query in %s: %s", method, orjson.dumps(plan).decode())
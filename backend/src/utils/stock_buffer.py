@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.schemas.product import StockAdjustmentDTO, StockAdjustmentStatus
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import ApplicationError, ValueOutOfRangeError
+from src.utils.limits import INT4_MAX, INT4_MIN
+from src.utils.metrics import STOCK_FLUSH_LATENCY
+
+logger = logging.getLogger(__name__)
+
+Entry = tuple[int, asyncio.Future]
+# a rejected entry carries the error its caller gets
+Result = StockAdjustmentDTO | ApplicationError
+
+
+class StockDeltaBuffer:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        flush_interval: float = 0.02,
+        max_deltas: int = 500,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_deltas = max_deltas
+        self.max_pending = max_pending
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._pending: dict[int, list[Entry]] = {}
+        self._count = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._slots = asyncio.Semaphore(self.max_pending)
+        # one flush at a time, a hot row is then only ever locked by a single transaction of this worker
+        self._flush_lock = asyncio.Lock()
+        self._flushes = set()
+
+    async def adjust(self, id: int, delta: int) -> StockAdjustmentDTO:
+        loop = asyncio.get_running_loop()
+        self._bind(loop)
+        async with self._slots:
+            future = loop.create_future()
+            self._pending.setdefault(id, []).append((delta, future))
+            self._count += 1
+            if self._count >= self.max_deltas:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.flush_interval, self._dispatch)
+            # an accepted delta is applied even if its caller goes away
+            return await asyncio.shield(future)
+
+    async def close(self) -> None:
+        if self._loop is None:
+            return
+        self._dispatch()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._count = self._pending, {}, 0
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: dict[int, list[Entry]]) -> None:
+        async with self._flush_lock:
+            start = time.perf_counter()
+            try:
+                results = await self._apply(batch)
+            except Exception as exc:
+                logger.exception("Failed to flush %d buffered stock deltas", sum(map(len, batch.values())))
+                for entries in batch.values():
+                    for _, future in entries:
+                        if not future.done():
+                            future.set_exception(exc)
+                return
+            finally:
+                STOCK_FLUSH_LATENCY.observe(time.perf_counter() - start)
+
+        for id, entries in batch.items():
+            for (_, future), result in zip(entries, results[id]):
+                if future.done():
+                    continue
+                if isinstance(result, ApplicationError):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def _apply(self, batch: dict[int, list[Entry]]) -> dict[int, list[Result]]:
+        merged = {id: sum(delta for delta, _ in entries) for id, entries in batch.items()}
+        results: dict[int, list[Result]] = {}
+        async with DBManager(session_factory=self.session_factory) as db:
+            # merged deltas that don't fit an int4 are settled entry by entry, like an overdraw
+            one_by_one = {id for id, delta in merged.items() if not INT4_MIN <= delta <= INT4_MAX}
+            try:
+                outcomes = await db.product.adjust_quantities({id: merged[id] for id in merged if id not in one_by_one})
+            except ValueOutOfRangeError:
+                # some quantity would leave the int4 range; the statement took the others down with it
+                await db.rollback()
+                outcomes, one_by_one = [], set(merged)
+            for outcome in outcomes:
+                if outcome.status == StockAdjustmentStatus.APPLIED:
+                    start = outcome.quantity - merged[outcome.id]  # type: ignore
+                    results[outcome.id], _ = self._replay(outcome.id, batch[outcome.id], start)
+                elif outcome.status == StockAdjustmentStatus.NOT_FOUND:
+                    results[outcome.id] = [outcome] * len(batch[outcome.id])
+                else:
+                    one_by_one.add(outcome.id)
+
+            # take deltas in arrival order while stock lasts
+            if one_by_one:
+                quantities = await db.product.lock_quantities(sorted(one_by_one))
+                accepted = {}
+                for id in sorted(one_by_one):
+                    if id not in quantities:
+                        # deleted since the first statement
+                        missing = StockAdjustmentDTO(id=id, status=StockAdjustmentStatus.NOT_FOUND)
+                        results[id] = [missing] * len(batch[id])
+                        continue
+                    results[id], final = self._replay(id, batch[id], quantities[id])
+                    if final != quantities[id]:
+                        accepted[id] = final - quantities[id]
+                if accepted:
+                    await db.product.adjust_quantities(accepted)
+            await db.commit()
+        return results
+
+    @staticmethod
+    def _replay(id: int, entries: list[Entry], quantity: int) -> tuple[list[Result], int]:
+        # deltas of one flush arrived together: restocks go first, decrements keep their arrival order
+        results: list[Result | None] = [None] * len(entries)
+        for idx in sorted(range(len(entries)), key=lambda idx: entries[idx][0] < 0):
+            delta = entries[idx][0]
+            if quantity + delta < 0:
+                results[idx] = StockAdjustmentDTO(id=id, status=StockAdjustmentStatus.INSUFFICIENT, quantity=quantity)
+            elif quantity + delta > INT4_MAX:
+                results[idx] = ValueOutOfRangeError(detail=f"quantity out of int32 range: {quantity + delta}")
+            else:
+                quantity += delta
+                results[idx] = StockAdjustmentDTO(id=id, status=StockAdjustmentStatus.APPLIED, quantity=quantity)
+        return results, quantity  # type: ignore
+
+
+_buffers: dict[async_sessionmaker, StockDeltaBuffer] = {}
+
+
+def get_stock_buffer(session_factory: async_sessionmaker) -> StockDeltaBuffer:
+    if session_factory not in _buffers:
+        _buffers[session_factory] = StockDeltaBuffer(
+            session_factory,
+            flush_interval=settings.stock_buffer.flush_interval_ms / 1000,
+            max_deltas=settings.stock_buffer.max_deltas,
+            max_pending=settings.stock_buffer.max_pending,
+        )
+    return _buffers[session_factory]
+
+
+async def close_stock_buffers() -> None:
+    for buffer in _buffers.values():
+        await buffer.close()
@@ -0,0 +1,59 @@
+import inspect
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable
+
+# "<Repo>.<method>" of the repository call currently talking to the database
+repo_method: ContextVar[str] = ContextVar("repo_method", default="other")
+
+
+def _trace_coroutine(func: Callable, label: str) -> Callable:
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> Any:
+        token = repo_method.set(label)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            repo_method.reset(token)
+
+    return wrapper
+
+
+def _trace_async_generator(func: Callable, label: str) -> Callable:
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> Any:
+        generator = func(*args, **kwargs)
+        try:
+            while True:
+                # only the steps run inside the generator are attributed to it, not the consumer in between
+                token = repo_method.set(label)
+                try:
+                    item = await generator.__anext__()
+                except StopAsyncIteration:
+                    return
+                finally:
+                    repo_method.reset(token)
+                yield item
+        finally:
+            await generator.aclose()
+
+    return wrapper
+
+
+def trace_methods(cls: type) -> None:
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        func = inspect.getattr_static(cls, name)
+        if isinstance(func, (staticmethod, classmethod)):
+            continue
+        func = getattr(func, "__traced__", func)
+        label = f"{cls.__name__}.{name}"
+        if inspect.iscoroutinefunction(func):
+            wrapper = _trace_coroutine(func, label)
+        elif inspect.isasyncgenfunction(func):
+            wrapper = _trace_async_generator(func, label)
+        else:
+            continue
+        wrapper.__traced__ = func  # type: ignore
+        setattr(cls, name, wrapper)
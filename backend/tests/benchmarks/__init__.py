@@ -0,0 +1,13 @@
+import time
+from typing import Callable
+
+ROWS_COUNT = 10_000
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -0,0 +1,18 @@
+import pytest
+
+from src.schemas.category import CategoryAddDTO
+from src.schemas.product import ProductAddDTO
+from src.utils.db_tools import DBManager
+from tests.benchmarks import ROWS_COUNT
+
+
+@pytest.fixture()
+async def many_products(db: DBManager, recreate_tables: None) -> None:
+    category = await db.category.add(CategoryAddDTO(title="bench"))  # type: ignore
+    await db.product.copy_bulk(
+        [
+            ProductAddDTO(title=f"product {idx}", price=idx / 3, quantity=idx, category_id=category.id)  # type: ignore
+            for idx in range(ROWS_COUNT)
+        ]
+    )
+    await db.commit()
@@ -0,0 +1,44 @@
+import time
+import tracemalloc
+
+from src.repos.product import ProductRepo
+from src.utils.db_tools import DBManager
+from tests.benchmarks import ROWS_COUNT
+
+
+async def measure(repo: ProductRepo, repeat: int = 3) -> tuple[float, int]:
+    timings, peaks = [], []
+    for _ in range(repeat):
+        repo.session.expunge_all()
+        start = time.perf_counter()
+        products = await repo.get_all_filtered()
+        timings.append(time.perf_counter() - start)
+        assert len(products) == ROWS_COUNT
+        del products
+
+        repo.session.expunge_all()
+        tracemalloc.start()
+        await repo.get_all_filtered()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return min(timings), min(peaks)
+
+
+async def test_core_reads_match_orm_reads(db: DBManager, many_products: None) -> None:
+    core_repo, orm_repo = ProductRepo(db.session), ProductRepo(db.session)
+    core_repo.core_reads, orm_repo.core_reads = True, False
+
+    assert await core_repo.get_all_filtered() == await orm_repo.get_all_filtered()
+    assert await core_repo.get_one(id=1) == await orm_repo.get_one(id=1)
+    assert await core_repo.get_one_or_none(id=ROWS_COUNT + 1) is None
+    assert await core_repo.get_page(limit=7, sort_by="price") == await orm_repo.get_page(limit=7, sort_by="price")
+
+
+async def test_core_reads_are_cheaper_than_orm_reads(db: DBManager, many_products: None) -> None:
+    core_repo, orm_repo = ProductRepo(db.session), ProductRepo(db.session)
+    core_repo.core_reads, orm_repo.core_reads = True, False
+
+    orm_time, orm_peak = await measure(orm_repo)
+    core_time, core_peak = await measure(core_repo)
+    stats = {"orm": (ROWS_COUNT / orm_time, orm_peak), "core": (ROWS_COUNT / core_time, core_peak)}
+    assert core_peak < orm_peak, stats
@@ -0,0 +1,73 @@
+import time
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+
+from src.db import engine_null_pool
+from src.schemas.category import CategoryAddDTO
+from src.schemas.product import ProductAddDTO
+from src.services.category import CategoryService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import RelatedProductsExistsError
+
+CATEGORY_SIZES = {"empty": 0, "small": 10, "big": 20_000}
+
+
+@pytest.fixture()
+async def sized_categories(db: DBManager, recreate_tables: None) -> dict[str, int]:
+    categories = await db.category.add_bulk([CategoryAddDTO(title=name) for name in CATEGORY_SIZES])  # type: ignore
+    ids = {category.title: category.id for category in categories}
+    products = [
+        ProductAddDTO(title=f"{name} {idx}", price=1.0, quantity=1, category_id=ids[name])  # type: ignore
+        for name, size in CATEGORY_SIZES.items()
+        for idx in range(size)
+    ]
+    await db.product.copy_bulk(products)
+    await db.commit()
+    async with engine_null_pool.connect() as conn:
+        await conn.execute(text("ANALYZE products"))
+    return ids
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def test_delete_category_runs_single_statement(
+    db: DBManager,
+    sized_categories: dict[str, int],
+    executed_statements: list[str],
+) -> None:
+    timings = {}
+    for name in ("big", "small", "empty"):
+        executed_statements.clear()
+        start = time.perf_counter()
+        try:
+            await CategoryService(db).delete_category(id=sized_categories[name])
+        except RelatedProductsExistsError:
+            assert CATEGORY_SIZES[name] > 0
+        timings[name] = time.perf_counter() - start
+        assert len(executed_statements) == 1, timings
+
+
+async def test_delete_category_plan_does_not_scan_products(
+    db: DBManager,
+    sized_categories: dict[str, int],
+    executed_queries: list[tuple[str, Any]],
+) -> None:
+    executed_queries.clear()
+    await CategoryService(db).delete_category(id=sized_categories["empty"])
+    await db.rollback()
+
+    ((statement, parameters),) = executed_queries
+    for name in CATEGORY_SIZES:
+        connection = await db.session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", (sized_categories[name],) * len(parameters)
+        )
+        (plan,) = result.scalar_one()
+        assert "products" not in find_seq_scans(plan["Plan"]), name
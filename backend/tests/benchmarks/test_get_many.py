@@ -0,0 +1,43 @@
+import random
+import time
+
+import pytest
+
+from src.repos.product import ProductRepo
+from src.utils.db_tools import DBManager
+
+
+@pytest.mark.parametrize("size", [10, 1_000, 100_000])
+async def test_get_many_uses_one_statement(
+    db: DBManager,
+    hundred_thousand_products: int,
+    executed_statements: list[str],
+    size: int,
+) -> None:
+    repo = ProductRepo(db.session)
+    ids = random.Random(size).sample(range(1, hundred_thousand_products + size // 10 + 1), size)
+
+    start = time.perf_counter()
+    items, missing = await repo.get_many(ids)
+    elapsed = time.perf_counter() - start
+
+    assert len(executed_statements) == 1, executed_statements
+    assert [item.id for item in items] == [id for id in ids if id <= hundred_thousand_products]
+    assert missing == [id for id in ids if id > hundred_thousand_products]
+    assert elapsed < 30, elapsed
+
+
+async def test_get_many_beats_one_lookup_per_id(db: DBManager, hundred_thousand_products: int) -> None:
+    repo = ProductRepo(db.session)
+    ids = random.Random(0).sample(range(1, hundred_thousand_products + 1), 1_000)
+
+    start = time.perf_counter()
+    looped = [await repo.get_one(id=id) for id in ids]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    items, _ = await repo.get_many(ids)
+    many_time = time.perf_counter() - start
+
+    assert items == looped
+    assert many_time < loop_time, {"loop": loop_time, "many": many_time}
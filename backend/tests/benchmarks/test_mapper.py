@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.models.product import Product
+from src.repos.mappers.mappers import ProductMapper
+from src.schemas.product import ProductDTO
+from src.utils.db_tools import DBManager
+from tests.benchmarks import ROWS_COUNT
+
+
+async def test_batched_mapping_matches_per_row(db: DBManager, many_products: None) -> None:
+    objs = (await db.session.execute(select(Product).order_by(Product.id))).scalars().all()
+    rows = (await db.session.execute(select(*Product.__table__.columns).order_by(Product.id))).all()
+    assert len(objs) == len(rows) == ROWS_COUNT
+
+    per_row = [ProductMapper.map_to_domain_entity(obj) for obj in objs]
+    assert ProductMapper.map_to_domain_entities(objs, trusted=False) == per_row
+    assert ProductMapper.map_to_domain_entities(rows, trusted=False) == per_row
+    assert ProductMapper.map_to_domain_entities(rows, trusted=True) == per_row
+    assert ProductMapper.map_to_domain_entities(objs, trusted=True) == per_row
+
+
+def test_trusted_entities_behave_like_validated() -> None:
+    now = datetime.now()
+    data = ProductDTO(id=1, title="one", price=1.0, quantity=1, category_id=1, created_at=now, updated_at=now)  # type: ignore
+    entity = ProductMapper.map_to_domain_entities([data], trusted=True)[0]
+    assert entity.model_dump() == data.model_dump()
+    entity.title = "two"
+    assert entity.model_dump()["title"] == "two"
+    assert "title" in entity.model_fields_set
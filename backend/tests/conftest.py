@@ -1,11 +1,14 @@
 # ruff: noqa: E402
 
 import json
-from typing import AsyncGenerator
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Callable, Generator
 
 import pytest
+from sqlalchemy import event, text
 
 from src.api.v1.dependencies.db import get_db_with_null_pool
+from src.cache import catalog_cache
 from src.config import BASE_DIR, settings
 from src.db import engine_null_pool
 from src.models import *  # noqa: F403
@@ -27,6 +30,32 @@ async def db_module() -> AsyncGenerator[DBManager, None]:
         yield db
 
 
+@contextmanager
+def recording_executes(record: Callable[[str, Any], None]) -> Generator[None, None, None]:
+    def collect(conn, cursor, statement, parameters, context, executemany) -> None:
+        record(statement, parameters)
+
+    event.listen(engine_null_pool.sync_engine, "before_cursor_execute", collect)
+    try:
+        yield
+    finally:
+        event.remove(engine_null_pool.sync_engine, "before_cursor_execute", collect)
+
+
+@pytest.fixture()
+def executed_statements() -> Generator[list[str], None, None]:
+    statements: list[str] = []
+    with recording_executes(lambda statement, _: statements.append(statement)):
+        yield statements
+
+
+@pytest.fixture()
+def executed_queries() -> Generator[list[tuple[str, Any]], None, None]:
+    queries: list[tuple[str, Any]] = []
+    with recording_executes(lambda statement, parameters: queries.append((statement, parameters))):
+        yield queries
+
+
 @pytest.fixture(scope="session", autouse=True)
 async def check_test_mode() -> None:
     assert settings.app.mode == "TEST"
@@ -38,6 +67,32 @@ async def recreate_tables(db: DBManager) -> None:
     async with engine_null_pool.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    catalog_cache.clear()
+
+
+@pytest.fixture(scope="module")
+async def hundred_thousand_products() -> int:
+    # seeded in sql, since plan and lookup checks need a table big enough for the planner to prefer indexes
+    count, categories = 100_000, 50
+    async with engine_null_pool.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            text("INSERT INTO categories (title) SELECT 'category ' || idx FROM generate_series(1, :count) AS idx"),
+            {"count": categories},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO products (title, price, quantity, category_id, created_at, updated_at) "
+                "SELECT 'product ' || idx, (idx * 7919 % 100000) / 10.0, idx % 5, idx % :categories + 1, "
+                "now() - idx * interval '1 minute', now() - (idx * 31 % :count) * interval '1 second' "
+                "FROM generate_series(1, :count) AS idx"
+            ),
+            {"count": count, "categories": categories},
+        )
+        await conn.execute(text("ANALYZE products"))
+    catalog_cache.clear()
+    return count
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -0,0 +1,61 @@
+import pytest
+from httpx import AsyncClient
+
+from src.schemas.product import ProductDTO, ProductUpdateDTO
+from src.utils.db_tools import DBManager
+
+
+@pytest.mark.parametrize("path", ["/api/v1/products", "/api/v1/categories", "/api/v1/categories?products=full"])
+async def test_unchanged_listing_answers_304(
+    client: AsyncClient,
+    fill_products_and_related_categories: list[ProductDTO],
+    path: str,
+) -> None:
+    response = await client.get(path)
+    assert response.status_code == 200
+    assert response.json()
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+
+    response = await client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert not response.content
+    assert response.headers["etag"] == etag
+
+    response = await client.get(path, headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+
+async def test_listing_representations_have_distinct_etags(
+    client: AsyncClient,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    full = await client.get("/api/v1/categories", params={"products": "full"})
+    summary = await client.get("/api/v1/categories")
+    assert full.headers["etag"] != summary.headers["etag"]
+    assert "products_count" in summary.json()[0] and "products" in full.json()[0]
+
+
+async def test_write_changes_etag(
+    client: AsyncClient,
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    products_etag = (await client.get("/api/v1/products")).headers["etag"]
+    categories_etag = (await client.get("/api/v1/categories?products=full")).headers["etag"]
+    categories_only_etag = (await client.get("/api/v1/categories?products=none")).headers["etag"]
+
+    product = fill_products_and_related_categories[0]
+    await db.product.edit_returning(ProductUpdateDTO(price=product.price + 1), id=product.id)  # type: ignore
+    await db.commit()
+
+    response = await client.get("/api/v1/products", headers={"If-None-Match": products_etag})
+    assert response.status_code == 200 and response.headers["etag"] != products_etag
+    response = await client.get("/api/v1/categories?products=full", headers={"If-None-Match": categories_etag})
+    assert response.status_code == 200
+    response = await client.get("/api/v1/categories?products=none", headers={"If-None-Match": categories_only_etag})
+    assert response.status_code == 304
+
+    await db.product.delete(id=product.id)
+    await db.commit()
+    response = await client.get("/api/v1/products", headers={"If-None-Match": products_etag})
+    assert response.status_code == 200
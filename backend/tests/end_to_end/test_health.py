@@ -0,0 +1,10 @@
+from httpx import AsyncClient
+
+
+async def test_pool_stats_are_reported(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/health/pool")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["size"] >= 1
+    assert stats["checked_out"] + stats["idle"] <= stats["size"] + stats["overflow"]
+    assert stats["wait_max"] >= stats["wait_avg"] >= 0
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from httpx import AsyncClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from src.config import BASE_DIR
+from src.schemas.product import ProductDTO
+
+
+def sample_value(text: str, name: str, **labels: str) -> float:
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == name and all(sample.labels.get(key) == value for key, value in labels.items()):
+                return sample.value
+    return 0.0
+
+
+async def test_metrics_cover_requests_queries_and_serialization(
+    client: AsyncClient,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    before = (await client.get("/metrics")).text
+    assert (await client.get("/api/v1/products")).status_code == 200
+    assert (await client.get("/api/v1/products/not-a-route")).status_code in (404, 405)
+    after = (await client.get("/metrics")).text
+
+    route = {"route": "/api/v1/products"}
+    request = {"method": "GET", "status": "200", **route}
+    assert sample_value(after, "http_request_duration_seconds_count", **request) == (
+        sample_value(before, "http_request_duration_seconds_count", **request) + 1
+    )
+    assert sample_value(after, "http_request_duration_seconds_count", route="unmatched") >= 1
+
+    method = {"repo_method": "ProductRepo.get_page"}
+    assert sample_value(after, "db_query_duration_seconds_count", **method) > sample_value(
+        before, "db_query_duration_seconds_count", **method
+    )
+    assert sample_value(after, "db_query_rows_sum", **method) - sample_value(before, "db_query_rows_sum", **method) == len(
+        fill_products_and_related_categories
+    )
+    assert sample_value(after, "response_serialization_seconds_count", **route) > sample_value(
+        before, "response_serialization_seconds_count", **route
+    )
+
+
+def test_metrics_aggregate_across_processes(tmp_path: Path) -> None:
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": str(BASE_DIR)}
+    observe = "from src.utils.metrics import QUERY_LATENCY; QUERY_LATENCY.labels('worker').observe(0.01)"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", observe], env=env, check=True)
+
+    render = "import sys; from src.utils.metrics import render_metrics; sys.stdout.buffer.write(render_metrics()[0])"
+    output = subprocess.run([sys.executable, "-c", render], env=env, check=True, capture_output=True).stdout.decode()
+    assert sample_value(output, "db_query_duration_seconds_count", repo_method="worker") == 2
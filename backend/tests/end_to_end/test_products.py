@@ -0,0 +1,55 @@
+import pytest
+from httpx import AsyncClient
+
+from src.schemas.product import ProductDTO
+from src.utils.pagination import encode_cursor
+
+
+async def test_listing_walks_pages_with_cursor(
+    client: AsyncClient,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    params = {"limit": 4, "sort_by": "price", "descending": True}
+    seen, cursor = [], None
+    while True:
+        response = await client.get("/api/v1/products", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 4
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(fill_products_and_related_categories, key=lambda product: (product.price, product.id), reverse=True)
+    assert seen == [product.id for product in expected]
+
+
+async def test_listing_rejects_oversized_page(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/products", params={"limit": 101})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/api/v1/products/search", {"q": "a", "cursor": "garbage"}),
+        ("/api/v1/products", {"cursor": "garbage"}),
+        ("/api/v1/products", {"cursor": encode_cursor("id", 2**40, 2**40)}),
+        ("/api/v1/products", {"cursor": encode_cursor("price", 1.0, 1), "sort_by": "title"}),
+    ],
+)
+async def test_listing_rejects_bad_cursor(
+    client: AsyncClient,
+    fill_products_and_related_categories: list[ProductDTO],
+    path: str,
+    params: dict[str, str],
+) -> None:
+    response = await client.get(path, params=params)
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid pagination cursor"}
+
+
+async def test_listing_rejects_category_id_outside_int4(client: AsyncClient) -> None:
+    response = await client.get("/api/v1/products", params={"category_ids": 99999999999})
+    assert response.status_code == 422
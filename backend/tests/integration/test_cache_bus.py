@@ -0,0 +1,112 @@
+import asyncio
+from typing import AsyncGenerator
+
+import asyncpg
+import pytest
+
+from src.cache import connect_listener
+from src.config import settings
+from src.schemas.category import CategoryAddDTO, CategoryDTO
+from src.utils.cache import AsyncTTLCache
+from src.utils.cache_bus import InvalidationListener, decode_invalidation, encode_invalidation
+from src.utils.db_tools import DBManager
+
+
+async def wait_for(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def fill(cache: AsyncTTLCache, key: str, depends_on: list) -> None:
+    async def loader() -> str:
+        return key
+
+    await cache.get_or_load(key, loader, depends_on)
+
+
+@pytest.fixture()
+async def listening_cache() -> AsyncGenerator[tuple[AsyncTTLCache, InvalidationListener], None]:
+    cache = AsyncTTLCache()
+    listener = InvalidationListener(cache, channel=settings.cache.channel, connect=connect_listener, min_backoff=0.05)
+    listener.start()
+    await asyncio.wait_for(listener.connected.wait(), 2)
+    yield cache, listener
+    await listener.stop()
+
+
+def test_oversized_payload_invalidates_whole_table() -> None:
+    assert decode_invalidation(encode_invalidation("products", {1, 2})) == ("products", {1, 2})
+    assert decode_invalidation(encode_invalidation("products", set(range(10_000)))) == ("products", None)
+
+
+async def test_notification_from_other_worker_evicts_entries(
+    listening_cache: tuple[AsyncTTLCache, InvalidationListener],
+) -> None:
+    cache, _ = listening_cache
+    await fill(cache, "one", [("categories", 1)])
+    await fill(cache, "two", [("categories", 2)])
+
+    conn = await connect_listener()
+    try:
+        await conn.execute("SELECT pg_notify($1, $2)", settings.cache.channel, encode_invalidation("categories", {1}))
+    finally:
+        await conn.close()
+
+    await wait_for(lambda: "one" not in cache)
+    assert "two" in cache
+
+
+async def test_commit_notifies_other_workers(
+    db: DBManager,
+    fill_categories: list[CategoryDTO],
+    listening_cache: tuple[AsyncTTLCache, InvalidationListener],
+) -> None:
+    cache, _ = listening_cache
+    await fill(cache, "categories", [("categories", None)])
+
+    await db.category.add(CategoryAddDTO(title="Notified category"))  # type: ignore
+    await asyncio.sleep(0.05)
+    assert "categories" in cache
+
+    await db.commit()
+    await wait_for(lambda: "categories" not in cache)
+
+
+async def test_listener_reconnects_and_drops_stale_entries(
+    listening_cache: tuple[AsyncTTLCache, InvalidationListener],
+) -> None:
+    cache, listener = listening_cache
+    await fill(cache, "stale", [("products", 1)])
+
+    conn = await connect_listener()
+    try:
+        await conn.execute(
+            "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE pid <> pg_backend_pid() AND query LIKE 'LISTEN%'"
+        )
+        await wait_for(lambda: not listener.connected.is_set())
+        await asyncio.wait_for(listener.connected.wait(), 2)
+        assert "stale" not in cache
+
+        await fill(cache, "fresh", [("products", 2)])
+        await conn.execute("SELECT pg_notify($1, $2)", settings.cache.channel, encode_invalidation("products", {2}))
+        await wait_for(lambda: "fresh" not in cache)
+    finally:
+        await conn.close()
+
+
+async def test_listener_survives_unexpected_connect_errors() -> None:
+    failures = [asyncpg.exceptions.ConnectionDoesNotExistError("connection was closed"), ConnectionRefusedError()]
+
+    async def flaky_connect() -> asyncpg.Connection:
+        if failures:
+            raise failures.pop(0)
+        return await connect_listener()
+
+    listener = InvalidationListener(AsyncTTLCache(), channel=settings.cache.channel, connect=flaky_connect, min_backoff=0.01)
+    listener.start()
+    try:
+        await asyncio.wait_for(listener.connected.wait(), 2)
+        assert not failures
+    finally:
+        await listener.stop()
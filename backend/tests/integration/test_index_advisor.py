@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.config import IndexAdvisorConfig
+from src.db import engine_null_pool
+from src.utils.db_tools import DBHealthChecker
+from src.utils.exceptions import IndexAdvisorError
+
+
+async def execute(*statements: str) -> None:
+    async with engine_null_pool.begin() as conn:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+
+async def test_current_schema_is_clean(recreate_tables: None) -> None:
+    report = await DBHealthChecker(engine_null_pool).check_indexes(IndexAdvisorConfig(strict=True))
+    assert not report.has_findings
+
+
+async def test_reports_unindexed_foreign_key(recreate_tables: None) -> None:
+    await execute("DROP INDEX ix_products_category_id_price_id")
+    checker = DBHealthChecker(engine_null_pool)
+    report = await checker.check_indexes(IndexAdvisorConfig())
+    assert report.unindexed_foreign_keys == ["products.category_id"]
+
+    with pytest.raises(IndexAdvisorError):
+        await checker.check_indexes(IndexAdvisorConfig(strict=True))
+
+
+async def test_reports_duplicate_indexes(recreate_tables: None) -> None:
+    await execute("CREATE INDEX ix_products_price_id_copy ON products (price, id)")
+    report = await DBHealthChecker(engine_null_pool).check_indexes(IndexAdvisorConfig())
+    assert report.duplicate_indexes == [["ix_products_price_id", "ix_products_price_id_copy"]]
+
+
+async def test_reports_unused_indexes_and_seq_scans(recreate_tables: None) -> None:
+    await execute(
+        "INSERT INTO categories (title) VALUES ('only')",
+        "INSERT INTO products (title, price, quantity, category_id) SELECT 'p' || idx, idx, 1, 1 FROM generate_series(1, 10) idx",
+        *["SELECT count(*) FROM products WHERE quantity > 0"] * 5,
+    )
+    config = IndexAdvisorConfig(min_scans=5, min_rows=0)
+    checker = DBHealthChecker(engine_null_pool)
+    # statistics reach the cumulative stats system shortly after the backend goes idle
+    for _ in range(50):
+        report = await checker.check_indexes(config)
+        if report.seq_scan_tables:
+            break
+        await asyncio.sleep(0.1)
+
+    assert report.seq_scan_tables.keys() == {"products"}
+    assert "products.ix_products_price_id" in report.unused_indexes
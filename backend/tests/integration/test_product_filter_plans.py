@@ -0,0 +1,50 @@
+from typing import Any
+
+import orjson
+import pytest
+
+from src.db import engine_null_pool
+from src.schemas.product import ProductFilterDTO, ProductSortField
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+
+
+def scanned_relations(plan: dict[str, Any], node_type: str) -> set[str]:
+    found = {plan["Relation Name"]} if plan["Node Type"] == node_type else set()
+    for child in plan.get("Plans", []):
+        found |= scanned_relations(child, node_type)
+    return found
+
+
+@pytest.mark.parametrize(
+    "filters, sort_by, descending",
+    [
+        (ProductFilterDTO(category_ids=[7]), ProductSortField.PRICE, False),
+        (ProductFilterDTO(category_ids=[7], price_min=100, price_max=2500), ProductSortField.PRICE, True),
+        (ProductFilterDTO(category_ids=[3, 7, 11], in_stock=True), ProductSortField.PRICE, False),
+        (ProductFilterDTO(price_min=500, price_max=600), ProductSortField.PRICE, False),
+        (ProductFilterDTO(in_stock=True), ProductSortField.PRICE, False),
+        (ProductFilterDTO(title_prefix="product 4242"), ProductSortField.ID, False),
+        (ProductFilterDTO(), ProductSortField.CREATED_AT, True),
+        (ProductFilterDTO(), ProductSortField.UPDATED_AT, False),
+        (ProductFilterDTO(in_stock=True), ProductSortField.UPDATED_AT, True),
+    ],
+)
+async def test_product_listing_avoids_seq_scan(
+    db: DBManager,
+    hundred_thousand_products: int,
+    executed_queries: list[tuple[str, Any]],
+    filters: ProductFilterDTO,
+    sort_by: ProductSortField,
+    descending: bool,
+) -> None:
+    page = await ProductService(db).get_products_page(filters=filters, sort_by=sort_by, descending=descending)
+    assert page.items
+    statement, parameters = executed_queries[-1]
+
+    async with engine_null_pool.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters))
+        plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = orjson.loads(plan)
+    assert "products" not in scanned_relations(plan[0]["Plan"], "Seq Scan"), orjson.dumps(plan).decode()
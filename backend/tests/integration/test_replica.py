@@ -0,0 +1,62 @@
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy import NullPool, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.db import engine_null_pool, sessionmaker_null_pool
+from src.models.base import Base
+from src.schemas.category import CategoryAddDTO, CategoryDTO
+from src.services.category import CategoryService
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+
+REPLICA_NAME = f"{settings.db.name}_replica"
+
+
+@pytest.fixture(scope="module")
+async def replica_sessionmaker() -> AsyncGenerator[async_sessionmaker, None]:
+    async with engine_null_pool.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        exists = await conn.scalar(text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": REPLICA_NAME})
+        if not exists:
+            await conn.execute(text(f'CREATE DATABASE "{REPLICA_NAME}"'))
+
+    engine = create_async_engine(settings.db.async_url.set(database=REPLICA_NAME), poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as session:
+        await session.execute(text("INSERT INTO categories (title) VALUES ('Only on replica')"))
+        await session.commit()
+    yield factory
+    await engine.dispose()
+
+
+@pytest.fixture()
+async def routed_db(replica_sessionmaker: async_sessionmaker) -> AsyncGenerator[DBManager, None]:
+    async with DBManager(session_factory=sessionmaker_null_pool, read_session_factory=replica_sessionmaker) as db:
+        yield db
+
+
+async def test_reads_go_to_replica(routed_db: DBManager, fill_categories: list[CategoryDTO]) -> None:
+    page = await CategoryService(routed_db).get_categories_page()
+    assert [item.title for item in page.items] == ["Only on replica"]
+    assert await ProductService(routed_db).get_products() == []
+
+
+async def test_reads_stick_to_primary_after_write(routed_db: DBManager, fill_categories: list[CategoryDTO]) -> None:
+    service = CategoryService(routed_db)
+    await service.add_category(CategoryAddDTO(title="Written on primary"))  # type: ignore
+    page = await service.get_categories_page(limit=100)
+    assert "Written on primary" in {item.title for item in page.items}
+
+    await routed_db.commit()
+    page = await service.get_categories_page(limit=100)
+    assert len(page.items) == len(fill_categories) + 1
+
+
+async def test_without_replica_reads_use_primary(db: DBManager) -> None:
+    assert db.read is db
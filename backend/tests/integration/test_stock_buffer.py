@@ -0,0 +1,147 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import delete
+
+from src.config import settings
+from src.db import sessionmaker_null_pool
+from src.models.product import Product
+from src.repos.product import ProductRepo
+from src.schemas.category import CategoryAddDTO
+from src.schemas.product import ProductAddDTO, ProductDTO, StockAdjustmentStatus
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import ValueOutOfRangeError
+from src.utils.stock_buffer import StockDeltaBuffer, close_stock_buffers
+
+
+@pytest.fixture()
+async def hot_product(db: DBManager, recreate_tables: None) -> ProductDTO:
+    category = await db.category.add(CategoryAddDTO(title="hot"))  # type: ignore
+    product = await db.product.add(ProductAddDTO(title="hot", price=1.0, quantity=30, category_id=category.id))  # type: ignore
+    await db.commit()
+    return product
+
+
+async def current_quantity(id: int) -> int:
+    async with DBManager(session_factory=sessionmaker_null_pool) as db:
+        return (await ProductService(db).get_product(id)).quantity
+
+
+async def test_merged_deltas_never_oversell(hot_product: ProductDTO, executed_statements: list[str]) -> None:
+    flushes_before = REGISTRY.get_sample_value("stock_buffer_flush_seconds_count") or 0
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=0.01)
+    results = await asyncio.gather(*(buffer.adjust(hot_product.id, -1) for _ in range(50)))
+
+    statuses = [result.status for result in results]
+    assert statuses.count(StockAdjustmentStatus.APPLIED) == 30
+    assert statuses.count(StockAdjustmentStatus.INSUFFICIENT) == 20
+    assert sorted(result.quantity for result in results if result.status == StockAdjustmentStatus.APPLIED) == list(range(30))
+    assert await current_quantity(hot_product.id) == 0
+    # one flush: the rejected merged delta, the row lock and the greedy remainder
+    assert len([statement for statement in executed_statements if "UPDATE products" in statement]) == 2
+    assert REGISTRY.get_sample_value("stock_buffer_flush_seconds_count") == flushes_before + 1
+
+
+async def test_restocks_in_the_same_flush_come_first(hot_product: ProductDTO) -> None:
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=0.01)
+    results = await asyncio.gather(
+        buffer.adjust(hot_product.id, -40),
+        buffer.adjust(hot_product.id, 15),
+        buffer.adjust(999_999, -1),
+    )
+    assert [(result.status, result.quantity) for result in results] == [
+        (StockAdjustmentStatus.APPLIED, 5),
+        (StockAdjustmentStatus.APPLIED, 45),
+        (StockAdjustmentStatus.NOT_FOUND, None),
+    ]
+    assert await current_quantity(hot_product.id) == 5
+
+
+async def test_full_buffer_flushes_early(hot_product: ProductDTO) -> None:
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=60, max_deltas=10)
+    results = await asyncio.wait_for(asyncio.gather(*(buffer.adjust(hot_product.id, -1) for _ in range(10))), timeout=5)
+    assert all(result.status == StockAdjustmentStatus.APPLIED for result in results)
+    assert await current_quantity(hot_product.id) == 20
+
+
+async def test_pending_deltas_are_bounded(hot_product: ProductDTO) -> None:
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=0.05, max_pending=5)
+    tasks = [asyncio.create_task(buffer.adjust(hot_product.id, -1)) for _ in range(20)]
+    await asyncio.sleep(0.01)
+    assert sum(map(len, buffer._pending.values())) == 5
+    await asyncio.gather(*tasks)
+    assert await current_quantity(hot_product.id) == 10
+
+
+async def test_close_flushes_pending_deltas(hot_product: ProductDTO) -> None:
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=60)
+    tasks = [asyncio.create_task(buffer.adjust(hot_product.id, -2)) for _ in range(3)]
+    await asyncio.sleep(0)
+    await buffer.close()
+    assert all(task.done() for task in tasks)
+    assert await current_quantity(hot_product.id) == 24
+
+
+async def test_service_goes_through_the_buffer_when_enabled(
+    db: DBManager,
+    hot_product: ProductDTO,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    service = ProductService(db)
+    result = await service.adjust_stock_buffered(hot_product.id, -1)
+    assert (result.status, result.quantity) == (StockAdjustmentStatus.APPLIED, 29)
+    # without the buffer the adjustment belongs to the caller's unit of work
+    assert await current_quantity(hot_product.id) == 30
+    await db.commit()
+
+    monkeypatch.setattr(settings.stock_buffer, "enabled", True)
+    results = await asyncio.gather(*(service.adjust_stock_buffered(hot_product.id, -1) for _ in range(5)))
+    assert sorted(result.quantity for result in results) == [24, 25, 26, 27, 28]
+    assert await current_quantity(hot_product.id) == 24
+    await close_stock_buffers()
+
+
+async def test_oversized_merged_delta_rejects_only_the_overflowing_entry(db: DBManager, hot_product: ProductDTO) -> None:
+    other = await db.product.add(ProductAddDTO(title="cold", price=1.0, quantity=1, category_id=hot_product.category_id))  # type: ignore
+    await db.commit()
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=0.01)
+    results = await asyncio.gather(
+        buffer.adjust(hot_product.id, 2**30),
+        buffer.adjust(hot_product.id, 2**30),
+        buffer.adjust(other.id, -1),
+        return_exceptions=True,
+    )
+    assert (results[0].status, results[0].quantity) == (StockAdjustmentStatus.APPLIED, 30 + 2**30)  # type: ignore
+    assert isinstance(results[1], ValueOutOfRangeError)
+    assert (results[2].status, results[2].quantity) == (StockAdjustmentStatus.APPLIED, 0)  # type: ignore
+    assert await current_quantity(hot_product.id) == 30 + 2**30
+
+
+async def test_quantity_overflow_falls_back_to_single_entries(db: DBManager, hot_product: ProductDTO) -> None:
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=0.01)
+    results = await asyncio.gather(
+        buffer.adjust(hot_product.id, 2**31 - 20),
+        buffer.adjust(hot_product.id, -5),
+        return_exceptions=True,
+    )
+    assert isinstance(results[0], ValueOutOfRangeError)
+    assert (results[1].status, results[1].quantity) == (StockAdjustmentStatus.APPLIED, 25)  # type: ignore
+    assert await current_quantity(hot_product.id) == 25
+
+
+async def test_product_deleted_before_the_lock_is_not_found(
+    hot_product: ProductDTO,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    lock_quantities = ProductRepo.lock_quantities
+
+    async def delete_then_lock(self: ProductRepo, ids: list[int]) -> dict[int, int]:
+        await self.session.execute(delete(Product).where(Product.id == hot_product.id))
+        return await lock_quantities(self, ids)
+
+    monkeypatch.setattr(ProductRepo, "lock_quantities", delete_then_lock)
+    buffer = StockDeltaBuffer(sessionmaker_null_pool, flush_interval=0.01)
+    results = await asyncio.gather(*(buffer.adjust(hot_product.id, -20) for _ in range(2)))
+    assert [result.status for result in results] == [StockAdjustmentStatus.NOT_FOUND] * 2
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from src.db import sessionmaker_null_pool
+from src.schemas.category import CategoryAddDTO
+from src.schemas.product import ProductAddDTO, ProductDTO, StockAdjustmentStatus
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import InsufficientStockError
+
+HOT_QUANTITY = 30
+ORDERS = 50
+
+
+@pytest.fixture()
+async def hot_products(db: DBManager, recreate_tables: None) -> list[ProductDTO]:
+    category = await db.category.add(CategoryAddDTO(title="hot"))  # type: ignore
+    products = await db.product.add_bulk(
+        [
+            ProductAddDTO(title="hot", price=1.0, quantity=HOT_QUANTITY, category_id=category.id),  # type: ignore
+            ProductAddDTO(title="plenty", price=1.0, quantity=ORDERS, category_id=category.id),  # type: ignore
+        ]
+    )
+    await db.commit()
+    return products
+
+
+async def decrement(id: int) -> bool:
+    async with DBManager(session_factory=sessionmaker_null_pool) as db:
+        try:
+            await ProductService(db).adjust_stock(id, -1)
+        except InsufficientStockError:
+            return False
+        await db.commit()
+        return True
+
+
+async def decrement_both(first: int, second: int) -> dict[int, StockAdjustmentStatus]:
+    async with DBManager(session_factory=sessionmaker_null_pool) as db:
+        results = await ProductService(db).adjust_stocks({first: -1, second: -1})
+        await db.commit()
+        return {result.id: result.status for result in results}
+
+
+async def test_concurrent_decrements_never_oversell(db: DBManager, hot_products: list[ProductDTO]) -> None:
+    hot = hot_products[0]
+    outcomes = await asyncio.gather(*(decrement(hot.id) for _ in range(ORDERS)))
+    assert outcomes.count(True) == HOT_QUANTITY
+    assert (await ProductService(db).get_product(hot.id)).quantity == 0
+
+
+async def test_concurrent_batches_never_oversell_or_deadlock(db: DBManager, hot_products: list[ProductDTO]) -> None:
+    hot, plenty = hot_products
+    # half of the batches list the rows the other way round
+    outcomes = await asyncio.wait_for(
+        asyncio.gather(
+            *(decrement_both(hot.id, plenty.id) if idx % 2 else decrement_both(plenty.id, hot.id) for idx in range(ORDERS))
+        ),
+        timeout=30,
+    )
+    assert [outcome[hot.id] for outcome in outcomes].count(StockAdjustmentStatus.APPLIED) == HOT_QUANTITY
+    assert all(outcome[plenty.id] == StockAdjustmentStatus.APPLIED for outcome in outcomes)
+    products = (await ProductService(db).get_products_by_ids([hot.id, plenty.id])).items
+    assert [product.quantity for product in products] == [0, 0]
@@ -4,7 +4,7 @@ from pydantic import ValidationError
 from src.schemas.product import ProductAddDTO, ProductDTO
 from src.services.product import ProductService
 from src.utils.db_tools import DBManager
-from src.utils.exceptions import CategoryNotFoundError
+from src.utils.exceptions import CategoryNotFoundError, ProductAlreadyExistsError
 
 
 async def test_add_single_product(
@@ -87,3 +87,48 @@ async def test_add_product_with_non_existing_category(db: DBManager, clear_categ
                 price=3.0,
             )
         )
+
+
+async def test_add_products_in_chunks(
+    db: DBManager,
+    product_examples: list[ProductAddDTO],
+    recreate_tables: None,
+    fill_categories: None,
+) -> None:
+    result = await ProductService(db).add_products(data=product_examples)
+    assert [item.title for item in result] == [item.title for item in product_examples]
+
+    await db.rollback()
+    result = await db.product.add_bulk(product_examples, chunk_size=3)
+    assert [item.title for item in result] == [item.title for item in product_examples]
+
+
+async def test_import_products(
+    db: DBManager,
+    product_examples: list[ProductAddDTO],
+    recreate_tables: None,
+    fill_categories: None,
+) -> None:
+    service = ProductService(db)
+    count = await service.import_products(data=product_examples, chunk_size=3)
+    assert count == len(product_examples)
+
+    products = await service.get_products()
+    assert sorted(item.title for item in products) == sorted(item.title for item in product_examples)
+    assert all(item.created_at and item.updated_at for item in products)
+
+
+async def test_import_existing_products(
+    db: DBManager,
+    product_examples: list[ProductAddDTO],
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    with pytest.raises(ProductAlreadyExistsError):
+        await ProductService(db).import_products(data=product_examples[:1])
+
+
+async def test_import_products_with_non_existing_category(db: DBManager, clear_categories: None) -> None:
+    with pytest.raises(CategoryNotFoundError):
+        await ProductService(db).import_products(
+            data=[ProductAddDTO(title="123", description="a", quantity=1, category_id=1, price=3.0)]
+        )
@@ -0,0 +1,43 @@
+import pytest
+
+from src.schemas.product import ProductDTO, StockAdjustmentDTO, StockAdjustmentStatus
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import InsufficientStockError, ProductNotFoundError
+
+
+async def test_adjust_stock_applies_delta(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    product = fill_products_and_related_categories[0]
+    service = ProductService(db)
+    assert await service.adjust_stock(product.id, -2) == product.quantity - 2
+    assert await service.adjust_stock(product.id, 5) == product.quantity + 3
+    await db.commit()
+    assert (await service.get_product(product.id)).quantity == product.quantity + 3
+
+
+async def test_adjust_stock_rejects_overdraw(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    product = fill_products_and_related_categories[0]
+    service = ProductService(db)
+    with pytest.raises(InsufficientStockError):
+        await service.adjust_stock(product.id, -(product.quantity + 1))
+    assert await service.adjust_stock(product.id, -product.quantity) == 0
+    with pytest.raises(ProductNotFoundError):
+        await service.adjust_stock(999_999, -1)
+
+
+@pytest.mark.parametrize("id", [2**40, -(2**40)])
+async def test_adjust_stock_out_of_range_id_is_not_found(db: DBManager, id: int) -> None:
+    with pytest.raises(ProductNotFoundError):
+        await ProductService(db).adjust_stock(id, 1)
+    assert (await ProductService(db).adjust_stocks({id: 1}))[0].status == StockAdjustmentStatus.NOT_FOUND
+
+
+async def test_adjust_stocks_reports_each_item(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    first, second = fill_products_and_related_categories[:2]
+    results = await ProductService(db).adjust_stocks({second.id: -1, 999_999: -1, first.id: -(first.quantity + 1), 2**40: 1})
+    assert results == [
+        StockAdjustmentDTO(id=second.id, status=StockAdjustmentStatus.APPLIED, quantity=second.quantity - 1),
+        StockAdjustmentDTO(id=999_999, status=StockAdjustmentStatus.NOT_FOUND),
+        StockAdjustmentDTO(id=first.id, status=StockAdjustmentStatus.INSUFFICIENT, quantity=first.quantity),
+        StockAdjustmentDTO(id=2**40, status=StockAdjustmentStatus.NOT_FOUND),
+    ]
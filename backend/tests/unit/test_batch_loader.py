@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.config import settings
+from src.schemas.product import ProductDTO, ProductUpdateDTO
+from src.services.product import ProductService
+from src.utils.batching import BatchLoader
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import ValueOutOfRangeError
+
+
+class CountingLoadMany:
+    def __init__(self, fail: Exception | None = None) -> None:
+        self.batches: list[list[int]] = []
+        self.fail = fail
+
+    async def __call__(self, ids: list[int]) -> dict[int, str]:
+        self.batches.append(ids)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise self.fail
+        return {id: f"item {id}" for id in ids if id % 2 == 0}
+
+
+async def test_concurrent_lookups_share_one_batch() -> None:
+    load_many = CountingLoadMany()
+    loader = BatchLoader(load_many, name="test")
+    results = await asyncio.gather(*(loader.load(id % 10) for id in range(50)))
+    assert results == [f"item {id % 10}" if id % 2 == 0 else None for id in range(50)]
+    assert len(load_many.batches) == 1 and sorted(load_many.batches[0]) == list(range(10))
+
+
+async def test_full_batches_are_dispatched_right_away() -> None:
+    load_many = CountingLoadMany()
+    loader = BatchLoader(load_many, name="test", window=60, max_batch_size=4)
+    await asyncio.wait_for(asyncio.gather(*(loader.load(id) for id in range(8))), timeout=1)
+    assert [len(batch) for batch in load_many.batches] == [4, 4]
+
+
+async def test_failure_reaches_every_waiter() -> None:
+    loader = BatchLoader(CountingLoadMany(fail=ConnectionResetError()), name="test")
+    results = await asyncio.gather(*(loader.load(id) for id in range(3)), return_exceptions=True)
+    assert all(isinstance(result, ConnectionResetError) for result in results)
+
+
+async def test_unexpected_failure_does_not_leave_waiters_hanging() -> None:
+    loader = BatchLoader(CountingLoadMany(fail=RuntimeError("boom")), name="test")
+    results = await asyncio.wait_for(asyncio.gather(*(loader.load(id) for id in range(3)), return_exceptions=True), 1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+async def test_out_of_range_id_is_rejected_before_batching() -> None:
+    load_many = CountingLoadMany()
+    loader = BatchLoader(load_many, name="test")
+    with pytest.raises(ValueOutOfRangeError):
+        await loader.load(2**31)
+    assert await loader.load(2) == "item 2"
+    assert load_many.batches == [[2]]
+
+
+@pytest.fixture()
+def batch_lookups(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings.db, "batch_lookups", True)
+
+
+async def test_get_product_coalesces_concurrent_calls(
+    batch_lookups: None,
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    executed_statements: list[str],
+) -> None:
+    before = REGISTRY.get_sample_value("db_batch_size_count", {"loader": "ProductRepo"}) or 0
+    ids = [product.id for product in fill_products_and_related_categories]
+    products = await asyncio.gather(*(ProductService(db).get_product(id) for id in ids))
+    assert [product.id for product in products] == ids
+    assert len([statement for statement in executed_statements if "FROM products" in statement]) == 1
+    assert REGISTRY.get_sample_value("db_batch_size_count", {"loader": "ProductRepo"}) == before + 1
+    assert REGISTRY.get_sample_value("db_batch_size_sum", {"loader": "ProductRepo"}) >= len(ids)
+
+
+async def test_get_product_sees_own_pending_writes(
+    batch_lookups: None,
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    service = ProductService(db)
+    product = fill_products_and_related_categories[0]
+    await service.update_product(product.id, ProductUpdateDTO(quantity=999))
+    assert db.batched is None
+    assert (await service.get_product(product.id)).quantity == 999
+
+
+async def test_get_product_skips_batching_by_default(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    assert db.batched is None
+    product = fill_products_and_related_categories[0]
+    assert await ProductService(db).get_product(product.id) == product
@@ -0,0 +1,73 @@
+import pytest
+
+from src.schemas.product import ProductDTO, ProductUpdateDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import CategoryNotFoundError, ProductAlreadyExistsError, ProductInvalidValueError
+
+
+async def test_bulk_update_applies_per_row_values(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    executed_statements: list[str],
+) -> None:
+    first, second, third = fill_products_and_related_categories[:3]
+    outcomes = await ProductService(db).update_products(
+        {
+            first.id: ProductUpdateDTO(price=1.5, quantity=0),
+            second.id: ProductUpdateDTO(price=2.5, quantity=7),
+            third.id: ProductUpdateDTO(title="Renamed"),
+            999_999: ProductUpdateDTO(price=1),
+            2**40: ProductUpdateDTO(price=1),
+            fill_products_and_related_categories[3].id: ProductUpdateDTO(),
+        }
+    )
+    await db.commit()
+    assert outcomes == {
+        first.id: True,
+        second.id: True,
+        third.id: True,
+        999_999: False,
+        2**40: False,
+        fill_products_and_related_categories[3].id: False,
+    }
+    # one statement per distinct set of updated fields
+    assert len([statement for statement in executed_statements if statement.startswith("UPDATE")]) == 3
+
+    updated = await db.product.get_many([first.id, second.id, third.id])
+    assert [(item.price, item.quantity, item.title) for item in updated[0]] == [
+        (1.5, 0, first.title),
+        (2.5, 7, second.title),
+        (third.price, third.quantity, "Renamed"),
+    ]
+    assert all(item.updated_at > first.updated_at for item in updated[0])
+
+
+async def test_bulk_update_is_chunked(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    executed_statements: list[str],
+) -> None:
+    data = {product.id: ProductUpdateDTO(quantity=42) for product in fill_products_and_related_categories}
+    outcomes = await ProductService(db).update_products(data, chunk_size=6)
+    assert all(outcomes.values())
+    assert len([statement for statement in executed_statements if statement.startswith("UPDATE")]) == -(-len(data) // 6)
+    assert {product.quantity for product in await ProductService(db).get_products()} == {42}
+
+
+async def test_bulk_update_maps_constraint_violations(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    service = ProductService(db)
+    first, second = fill_products_and_related_categories[:2]
+    with pytest.raises(ProductInvalidValueError):
+        await service.update_products(
+            {first.id: ProductUpdateDTO(price=1), second.id: ProductUpdateDTO.model_construct(price=-1)}
+        )
+    await db.rollback()
+    with pytest.raises(ProductAlreadyExistsError):
+        await service.update_products({first.id: ProductUpdateDTO(title=second.title)})
+    await db.rollback()
+    with pytest.raises(CategoryNotFoundError):
+        await service.update_products({first.id: ProductUpdateDTO(category_id=999_999)})
@@ -0,0 +1,129 @@
+import asyncio
+
+from sqlalchemy import text
+
+from src.db import engine_null_pool
+from src.schemas.category import CategoryAddDTO, CategoryDTO, CategoryProductsLoad
+from src.schemas.product import ProductUpdateDTO
+from src.services.category import CategoryService
+from src.services.product import ProductService
+from src.utils.cache import AsyncTTLCache
+from src.utils.db_tools import DBManager
+
+
+class CountingLoader:
+    def __init__(self, value: object = "value", delay: float = 0.0) -> None:
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> object:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+async def test_concurrent_misses_load_once() -> None:
+    cache = AsyncTTLCache()
+    loader = CountingLoader(delay=0.05)
+    results = await asyncio.gather(*(cache.get_or_load("key", loader, [("categories", None)]) for _ in range(20)))
+    assert results == ["value"] * 20
+    assert loader.calls == 1
+
+
+async def test_entries_expire_after_ttl() -> None:
+    cache = AsyncTTLCache(ttl=0.01)
+    loader = CountingLoader()
+    await cache.get_or_load("key", loader, [])
+    await asyncio.sleep(0.02)
+    await cache.get_or_load("key", loader, [])
+    assert loader.calls == 2
+
+
+async def test_least_recently_used_entry_is_evicted() -> None:
+    cache = AsyncTTLCache(maxsize=2)
+    for key in ("a", "b", "a", "c"):
+        await cache.get_or_load(key, CountingLoader(), [])
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+
+async def test_invalidation_matches_table_and_ids() -> None:
+    cache = AsyncTTLCache()
+    await cache.get_or_load("one", CountingLoader(), [("categories", 1)])
+    await cache.get_or_load("two", CountingLoader(), [("categories", 2)])
+    await cache.get_or_load("all", CountingLoader(), [("categories", None)])
+    await cache.get_or_load("products", CountingLoader(), [("products", None)])
+
+    cache.invalidate("categories", [1])
+    assert "one" not in cache and "all" not in cache
+    assert "two" in cache and "products" in cache
+
+    cache.invalidate("products")
+    assert "products" not in cache and "two" in cache
+
+
+async def test_value_loaded_across_invalidation_is_not_stored() -> None:
+    cache = AsyncTTLCache()
+    loading = asyncio.create_task(cache.get_or_load("key", CountingLoader(delay=0.05), [("categories", None)]))
+    await asyncio.sleep(0.01)
+    cache.invalidate("categories")
+    assert await loading == "value"
+    assert "key" not in cache
+
+
+async def test_waiters_take_over_when_loader_is_cancelled() -> None:
+    cache = AsyncTTLCache()
+    first = asyncio.create_task(cache.get_or_load("key", CountingLoader(delay=1), []))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(cache.get_or_load("key", CountingLoader(value="other"), []))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == "other"
+
+
+async def test_service_reads_are_cached_until_commit(
+    db: DBManager,
+    fill_categories: list[CategoryDTO],
+    executed_statements: list[str],
+) -> None:
+    service = CategoryService(db)
+    categories = await service.get_categories(products=CategoryProductsLoad.NONE)
+    executed_statements.clear()
+    assert await service.get_categories(products=CategoryProductsLoad.NONE) == categories
+    assert not executed_statements
+
+    await service.add_category(CategoryAddDTO(title="Fresh category"))  # type: ignore
+    assert len(await service.get_categories(products=CategoryProductsLoad.NONE)) == len(categories) + 1
+    await db.commit()
+    assert len(await service.get_categories(products=CategoryProductsLoad.NONE)) == len(categories) + 1
+
+
+async def test_product_write_evicts_category_with_products(
+    db: DBManager,
+    fill_products_and_related_categories: list,
+) -> None:
+    product = fill_products_and_related_categories[0]
+    service = CategoryService(db)
+    await service.get_category(id=product.category_id)
+    await ProductService(db).update_product(id=product.id, data=ProductUpdateDTO(title="Renamed product"))  # type: ignore
+    await db.commit()
+
+    category = await service.get_category(id=product.category_id)
+    assert "Renamed product" in {item.title for item in category.products}  # type: ignore
+
+
+async def test_entry_is_keyed_by_validated_version(db: DBManager, fill_categories: list[CategoryDTO]) -> None:
+    service = CategoryService(db)
+    version = await service.get_categories_version(products=CategoryProductsLoad.NONE)
+    categories = await service.get_categories(products=CategoryProductsLoad.NONE, version=version.version)
+
+    # a write by another worker whose invalidation has not reached this one yet
+    async with engine_null_pool.begin() as conn:
+        await conn.execute(
+            text("UPDATE categories SET description = 'changed elsewhere' WHERE id = :id"), {"id": categories[0].id}
+        )
+
+    assert await service.get_categories(products=CategoryProductsLoad.NONE, version=version.version) == categories
+    version = await service.get_categories_version(products=CategoryProductsLoad.NONE)
+    fresh = await service.get_categories(products=CategoryProductsLoad.NONE, version=version.version)
+    assert fresh[0].description == "changed elsewhere"
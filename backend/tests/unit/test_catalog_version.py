@@ -0,0 +1,55 @@
+from src.schemas.category import CategoryAddDTO, CategoryProductsLoad
+from src.schemas.product import ProductDTO, ProductUpdateDTO
+from src.services.category import CategoryService
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+
+
+async def test_commit_bumps_version_once_per_table(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    before = await ProductService(db).get_products_version()
+    for product in fill_products_and_related_categories[:3]:
+        await db.product.edit_returning(ProductUpdateDTO(price=product.price + 1), id=product.id)  # type: ignore
+    await db.commit()
+
+    after = await ProductService(db).get_products_version()
+    assert after.version == before.version + 1
+    assert after.last_modified is not None and after.last_modified >= before.last_modified  # type: ignore
+
+
+async def test_delete_and_rollback(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    service = ProductService(db)
+    before = await service.get_products_version()
+    await db.product.delete(id=fill_products_and_related_categories[0].id)
+    await db.rollback()
+    assert await service.get_products_version() == before
+
+    await db.product.delete(id=fill_products_and_related_categories[0].id)
+    await db.commit()
+    assert (await service.get_products_version()).version == before.version + 1
+
+
+async def test_category_version_covers_products_only_when_asked(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    service = CategoryService(db)
+    categories_only = await service.get_categories_version(products=CategoryProductsLoad.NONE)
+    with_products = await service.get_categories_version(products=CategoryProductsLoad.COUNT)
+    assert with_products.version > categories_only.version
+
+    await db.category.add(CategoryAddDTO(title="Versioned category"))  # type: ignore
+    await db.commit()
+    assert (await service.get_categories_version(products=CategoryProductsLoad.NONE)).version == categories_only.version + 1
+
+
+async def test_version_does_not_read_catalog_tables(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    executed_statements: list[str],
+) -> None:
+    await ProductService(db).get_products_version()
+    assert len(executed_statements) == 1
+    assert "FROM catalog_versions" in executed_statements[0] and "FROM products" not in executed_statements[0]
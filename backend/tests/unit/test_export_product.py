@@ -0,0 +1,31 @@
+import csv
+import io
+
+import orjson
+
+from src.schemas.product import ProductDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.export import ExportFormat
+
+
+async def test_export_ndjson(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    chunks = [chunk async for chunk in ProductService(db).export_products(format=ExportFormat.NDJSON, batch_size=3)]
+    assert len(chunks) == -(-len(fill_products_and_related_categories) // 3)
+
+    lines = b"".join(chunks).splitlines()
+    exported = [ProductDTO.model_validate(orjson.loads(line)) for line in lines]
+    assert [item.id for item in exported] == sorted(item.id for item in fill_products_and_related_categories)
+
+
+async def test_export_csv(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    chunks = [chunk async for chunk in ProductService(db).export_products(format=ExportFormat.CSV, batch_size=4)]
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+    assert len(rows) == len(fill_products_and_related_categories)
+    assert set(rows[0]) == set(ProductDTO.model_fields)
+    assert {int(row["id"]) for row in rows} == {item.id for item in fill_products_and_related_categories}
+
+
+async def test_export_empty_table(db: DBManager, clear_products: None) -> None:
+    chunks = [chunk async for chunk in ProductService(db).export_products(format=ExportFormat.NDJSON)]
+    assert b"".join(chunks) == b""
@@ -0,0 +1,68 @@
+import pytest
+from pydantic import ValidationError
+
+from src.schemas.product import ProductDTO, ProductFilterDTO, ProductSortField, ProductUpdateDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+
+
+async def test_filter_by_price_range_and_categories(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    filters = ProductFilterDTO(price_min=20_000, price_max=100_000, category_ids=[1, 3])
+    products = await ProductService(db).get_products(filters, sort_by=ProductSortField.PRICE)
+    expected = sorted(
+        (item for item in fill_products_and_related_categories if 20_000 <= item.price <= 100_000 and item.category_id in {1, 3}),
+        key=lambda item: (item.price, item.id),
+    )
+    assert products and [item.id for item in products] == [item.id for item in expected]
+
+
+async def test_filter_in_stock(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    service = ProductService(db)
+    sold_out = fill_products_and_related_categories[0]
+    await service.update_product(sold_out.id, ProductUpdateDTO(quantity=0))
+    await db.commit()
+
+    in_stock = await service.get_products(ProductFilterDTO(in_stock=True))
+    assert sold_out.id not in {item.id for item in in_stock}
+    assert len(in_stock) == len(fill_products_and_related_categories) - 1
+    assert [item.id for item in await service.get_products(ProductFilterDTO(in_stock=False))] == [sold_out.id]
+
+
+async def test_filter_by_title_prefix(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    service = ProductService(db)
+    products = await service.get_products(ProductFilterDTO(title_prefix="Xiaomi"))
+    assert {item.title for item in products} == {"Xiaomi 14 Pro", "Xiaomi Robot Vacuum S12"}
+    # LIKE wildcards in the prefix are matched literally
+    assert await service.get_products(ProductFilterDTO(title_prefix="%")) == []
+    assert await service.get_products(ProductFilterDTO(title_prefix="_iaomi")) == []
+
+
+async def test_sort_descending_pages(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    service = ProductService(db)
+    filters = ProductFilterDTO(category_ids=[2, 5])
+    everything = await service.get_products(filters, sort_by=ProductSortField.PRICE, descending=True)
+
+    seen = []
+    cursor = None
+    while True:
+        page = await service.get_products_page(cursor=cursor, limit=3, sort_by="price", descending=True, filters=filters)
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert [item.id for item in seen] == [item.id for item in everything]
+    assert all(item.category_id in {2, 5} for item in seen)
+
+
+def test_reject_inverted_price_range() -> None:
+    with pytest.raises(ValidationError):
+        ProductFilterDTO(price_min=10, price_max=5)
+
+
+@pytest.mark.parametrize("category_id", [0, -1, 2**31])
+def test_reject_category_id_outside_int4(category_id: int) -> None:
+    with pytest.raises(ValidationError):
+        ProductFilterDTO(category_ids=[1, category_id])
@@ -0,0 +1,31 @@
+from src.schemas.category import CategoryDTO
+from src.schemas.product import ProductDTO
+from src.services.category import CategoryService
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+
+
+async def test_get_many_keeps_input_order_and_reports_missing(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    executed_statements: list[str],
+) -> None:
+    by_id = {product.id: product for product in fill_products_and_related_categories}
+    ids = [3, 999_999, 1, 2**40, 3, -5, 7]
+    result = await ProductService(db).get_products_by_ids(ids)
+    assert result.items == [by_id[3], by_id[1], by_id[7]]
+    assert result.missing == [999_999, 2**40, -5]
+    assert len(executed_statements) == 1
+
+
+async def test_get_many_without_ids_skips_the_query(db: DBManager, executed_statements: list[str]) -> None:
+    result = await ProductService(db).get_products_by_ids([])
+    assert result.items == [] and result.missing == []
+    assert executed_statements == []
+
+
+async def test_get_many_categories(db: DBManager, fill_categories: list[CategoryDTO]) -> None:
+    ids = [category.id for category in reversed(fill_categories)]
+    result = await CategoryService(db).get_categories_by_ids(ids + [0])
+    assert [category.id for category in result.items] == ids
+    assert result.missing == [0]
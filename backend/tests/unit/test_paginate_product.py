@@ -0,0 +1,77 @@
+import pytest
+
+from src.schemas.product import ProductDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import InvalidCursorError, InvalidPageSizeError, InvalidSortFieldError
+
+
+async def test_walk_all_pages(db: DBManager, fill_products_and_related_categories: list[ProductDTO]) -> None:
+    service = ProductService(db)
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = await service.get_products_page(cursor=cursor, limit=3)
+        assert len(page.items) <= 3
+        seen.extend(item.id for item in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == len(set(seen)) == len(fill_products_and_related_categories)
+    assert seen == sorted(seen)
+
+
+async def test_walk_pages_sorted_by_price_desc(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    service = ProductService(db)
+    seen: list[ProductDTO] = []
+    cursor = None
+    while True:
+        page = await service.get_products_page(cursor=cursor, limit=4, sort_by="price", descending=True)
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert len({item.id for item in seen}) == len(fill_products_and_related_categories)
+    assert [(item.price, item.id) for item in seen] == sorted(((item.price, item.id) for item in seen), reverse=True)
+
+
+async def test_walk_pages_sorted_by_created_at(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    service = ProductService(db)
+    first = await service.get_products_page(limit=5, sort_by="created_at")
+    assert first.next_cursor
+    second = await service.get_products_page(cursor=first.next_cursor, limit=5, sort_by="created_at")
+    assert not {item.id for item in first.items} & {item.id for item in second.items}
+
+
+async def test_raises_exc_while_invalid_cursor(db: DBManager) -> None:
+    with pytest.raises(InvalidCursorError):
+        await ProductService(db).get_products_page(cursor="not-a-cursor")
+
+
+async def test_raises_exc_while_cursor_of_other_sort_field(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    page = await ProductService(db).get_products_page(limit=1, sort_by="price")
+    assert page.next_cursor
+    with pytest.raises(InvalidCursorError):
+        await ProductService(db).get_products_page(cursor=page.next_cursor, sort_by="title")
+
+
+async def test_raises_exc_while_unsupported_sort_field(db: DBManager) -> None:
+    with pytest.raises(InvalidSortFieldError):
+        await ProductService(db).get_products_page(sort_by="description")
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+async def test_raises_exc_while_page_size_below_one(db: DBManager, limit: int) -> None:
+    with pytest.raises(InvalidPageSizeError):
+        await ProductService(db).get_products_page(limit=limit)
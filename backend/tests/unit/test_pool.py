@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import GunicornConfig, Settings, settings
+from src.utils.db_tools import DBHealthChecker
+from src.utils.pool import InstrumentedAsyncPool
+
+
+@pytest.mark.parametrize(
+    ("workers", "pool_size", "max_overflow"),
+    [(1, 10, 10), (4, 10, 10), (8, 10, 0), (30, 2, 0), (200, 1, 0)],
+)
+def test_pool_sizes_derive_from_workers(workers: int, pool_size: int, max_overflow: int) -> None:
+    db = settings.db.model_copy(update={"pool_size": None, "max_overflow": None})
+    derived = Settings(db=db, app=settings.app, gunicorn=GunicornConfig(workers=workers))
+    assert (derived.db.pool_size, derived.db.max_overflow) == (pool_size, max_overflow)
+    assert workers * (pool_size + max_overflow + 1) <= max(db.max_connections, 2 * workers)
+
+
+def test_explicit_pool_sizes_are_kept() -> None:
+    db = settings.db.model_copy(update={"pool_size": 3, "max_overflow": 1})
+    derived = Settings(db=db, app=settings.app, gunicorn=GunicornConfig(workers=64))
+    assert (derived.db.pool_size, derived.db.max_overflow) == (3, 1)
+
+
+async def test_pool_records_waits_and_timeouts() -> None:
+    engine = create_async_engine(
+        settings.db.async_url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    pool: InstrumentedAsyncPool = engine.pool  # type: ignore
+    try:
+        await DBHealthChecker(engine).warm_up(1)
+        assert pool.checkedin() == 1
+
+        async def hold(seconds: float) -> None:
+            async with engine.connect():
+                await asyncio.sleep(seconds)
+
+        holder = asyncio.create_task(hold(0.1))
+        await asyncio.sleep(0.01)
+        async with engine.connect():
+            pass
+        await holder
+        assert pool.stats()["wait_max"] >= 0.05
+
+        holder = asyncio.create_task(hold(0.5))
+        await asyncio.sleep(0.01)
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+        await holder
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        await engine.dispose()
@@ -1,6 +1,6 @@
 import pytest
 
-from src.schemas.category import CategoryDTO, CategoryWithProductsDTO
+from src.schemas.category import CategoryDTO, CategoryProductsLoad, CategorySummaryDTO, CategoryWithProductsDTO
 from src.schemas.product import ProductDTO
 from src.services.category import CategoryService
 from src.utils.db_tools import DBManager
@@ -34,3 +34,38 @@ async def test_get_related_products(db: DBManager, fill_products_and_related_cat
     assert category[0].products
     assert all(isinstance(item, ProductDTO) for item in category[0].products)
     assert all(item.category_id == category[0].id for item in category[0].products)
+
+
+async def test_get_categories_without_products(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    categories = await CategoryService(db).get_categories(products=CategoryProductsLoad.NONE)
+    assert categories
+    assert all(type(item) is CategoryDTO for item in categories)
+
+
+async def test_get_categories_with_products_count(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    categories = await CategoryService(db).get_categories(products=CategoryProductsLoad.COUNT)
+    assert all(isinstance(item, CategorySummaryDTO) for item in categories)
+    counts = {item.id: item.products_count for item in categories}  # type: ignore
+    for product in fill_products_and_related_categories:
+        assert counts[product.category_id] > 0
+    assert sum(counts.values()) == len(fill_products_and_related_categories)
+
+
+async def test_get_categories_with_first_products(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    categories = await CategoryService(db).get_categories(products=CategoryProductsLoad.FIRST, products_limit=2)
+    assert categories
+    assert all(isinstance(item, CategoryWithProductsDTO) for item in categories)
+    for category in categories:
+        products = category.products  # type: ignore
+        assert len(products) <= 2
+        assert all(item.category_id == category.id for item in products)
+        assert [item.id for item in products] == sorted(item.id for item in products)
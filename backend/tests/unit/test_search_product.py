@@ -0,0 +1,64 @@
+import pytest
+
+from src.schemas.product import ProductDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import InvalidPageSizeError
+
+
+async def test_search_matches_title_and_description(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    page = await ProductService(db).search_products("смартфон")
+    titles = {item.title for item in page.items}
+    assert {"iPhone 15 Pro Max 256GB", "Samsung Galaxy S24 Ultra"} <= titles
+    assert page.next_cursor is None
+
+    page = await ProductService(db).search_products("xiaomi")
+    assert {item.title for item in page.items} == {"Xiaomi 14 Pro", "Xiaomi Robot Vacuum S12"}
+
+
+async def test_search_ranks_title_hits_first(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    page = await ProductService(db).search_products("iphone")
+    ranks = [item.rank for item in page.items]
+    assert ranks == sorted(ranks, reverse=True) and ranks[0] > 0
+    assert "iPhone" in page.items[0].title
+
+
+async def test_search_pages_through_all_hits(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    service = ProductService(db)
+    everything = await service.search_products("pro", limit=100)
+    assert len(everything.items) > 3
+
+    seen = []
+    cursor = None
+    while True:
+        page = await service.search_products("pro", cursor=cursor, limit=2)
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    assert [item.id for item in seen] == [item.id for item in everything.items]
+
+
+async def test_search_without_hits_is_empty(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    page = await ProductService(db).search_products("несуществующийтовар")
+    assert page.items == [] and page.next_cursor is None
+
+
+async def test_search_rejects_empty_page_size(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    with pytest.raises(InvalidPageSizeError):
+        await ProductService(db).search_products("iphone", limit=0)
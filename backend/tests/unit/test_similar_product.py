@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import text
+
+from src.schemas.category import CategoryDTO
+from src.schemas.product import ProductDTO
+from src.services.category import CategoryService
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+
+
+@pytest.fixture()
+async def pg_trgm(db: DBManager) -> None:
+    installed = await db.session.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"))
+    if not installed:
+        pytest.skip("pg_trgm is not available on this server")
+
+
+async def test_similar_products_tolerate_typos(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    pg_trgm: None,
+) -> None:
+    items = await ProductService(db).get_similar_products("Xiaomy 14 Pr")
+    assert items and items[0].title == "Xiaomi 14 Pro"
+    similarities = [item.similarity for item in items]
+    assert similarities == sorted(similarities, reverse=True)
+    assert all(0.3 <= value <= 1 for value in similarities)
+
+
+async def test_similar_products_respect_limit_and_threshold(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    pg_trgm: None,
+) -> None:
+    service = ProductService(db)
+    assert len(await service.get_similar_products("Pro", limit=2, threshold=0)) == 2
+    assert await service.get_similar_products("qwzx", threshold=0.3) == []
+    exact = await service.get_similar_products("Xiaomi 14 Pro", threshold=1)
+    assert [item.title for item in exact] == ["Xiaomi 14 Pro"]
+
+
+async def test_similar_categories_tolerate_typos(
+    db: DBManager,
+    fill_categories: list[CategoryDTO],
+    pg_trgm: None,
+) -> None:
+    items = await CategoryService(db).get_similar_categories("Смартфны")
+    assert items and items[0].title == "Смартфоны"
@@ -0,0 +1,90 @@
+import logging
+from typing import Generator
+
+import pytest
+
+from src.db import engine_null_pool
+from src.schemas.category import CategoryAddDTO, CategoryDTO
+from src.schemas.product import ProductDTO
+from src.utils.db_tools import DBManager
+from src.utils.slow_queries import SlowQueryLog, is_explainable, normalize_sql, redact_params
+
+
+@pytest.fixture()
+def slow_query_log() -> Generator[SlowQueryLog, None, None]:
+    log = SlowQueryLog(threshold=0, explain_engine=engine_null_pool, sample_rate=1)
+    log.attach(engine_null_pool)
+    yield log
+    log.detach(engine_null_pool)
+
+
+def test_sql_is_normalized_and_params_redacted() -> None:
+    assert normalize_sql("SELECT *\n  FROM t\n WHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER)") == (
+        "SELECT * FROM t WHERE id IN ($n, ...)"
+    )
+    assert redact_params(("secret", 42, None, [1, 2])) == ["str[6]", "int", "null", "list[2]"]
+    assert redact_params([("a", 1), ("b", 2)]) == [["str[1]", "int"], "... 2 rows"]
+
+
+@pytest.mark.parametrize(
+    "statement, explainable",
+    [
+        ("SELECT * FROM products WHERE id = $1", True),
+        ("WITH ranked AS (SELECT id FROM products) SELECT * FROM ranked", True),
+        ("WITH deleted AS (DELETE FROM categories WHERE id = $1 RETURNING id) SELECT * FROM deleted", False),
+        ("SELECT id FROM products WHERE id = ANY($1) ORDER BY id FOR UPDATE", False),
+        ("SELECT id FROM products FOR KEY SHARE", False),
+        ("UPDATE products SET price = $1", False),
+    ],
+)
+def test_only_read_only_statements_are_explained(statement: str, explainable: bool) -> None:
+    assert is_explainable(statement) is explainable
+
+
+async def test_slow_select_is_logged_and_explained(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    slow_query_log: SlowQueryLog,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    title = fill_products_and_related_categories[0].title
+    with caplog.at_level(logging.WARNING, logger="src.utils.slow_queries"):
+        await db.product.get_one(title=title)
+        await slow_query_log.drain()
+
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Slow query")]
+    plans = [record.getMessage() for record in caplog.records if record.getMessage().startswith("Plan of slow query")]
+    assert any("ProductRepo.get_one:" in message and "FROM products" in message for message in slow)
+    assert all(title not in message for message in slow)
+    assert len(plans) == 1 and "ProductRepo.get_one" in plans[0] and "Shared Hit Blocks" in plans[0]
+
+
+async def test_writes_are_logged_but_never_explained(
+    db: DBManager,
+    slow_query_log: SlowQueryLog,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with caplog.at_level(logging.WARNING, logger="src.utils.slow_queries"):
+        await db.category.add(CategoryAddDTO(title="Slow category"))  # type: ignore
+        await db.rollback()
+        await slow_query_log.drain()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Slow query") and "CategoryRepo.add" in message for message in messages)
+    assert not any(message.startswith("Plan of slow query") for message in messages)
+
+
+async def test_data_modifying_cte_is_never_explained(
+    db: DBManager,
+    fill_categories: list[CategoryDTO],
+    slow_query_log: SlowQueryLog,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    with caplog.at_level(logging.WARNING, logger="src.utils.slow_queries"):
+        await db.category.delete_without_products(fill_categories[-1].id)
+        await db.rollback()
+        await slow_query_log.drain()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("Slow query") and "CategoryRepo.delete_without_products" in message for message in messages)
+    assert not any(message.startswith(("Plan of slow query", "Failed to capture")) for message in messages)
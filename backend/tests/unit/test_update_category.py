@@ -48,6 +48,14 @@ async def test_update_only_one_field(db: DBManager, fill_categories: list[Catego
     assert new.title != old.title and new.description != old.description
 
 
+async def test_update_returns_updated_category(db: DBManager, fill_categories: list[CategoryDTO]) -> None:
+    old = fill_categories[0]
+    new = await CategoryService(db).update_category(id=old.id, data=CategoryUpdateDTO(title="123"))  # type: ignore
+    assert new.id == old.id
+    assert new.title == "123" and new.description == old.description
+    assert new.updated_at > old.updated_at
+
+
 async def test_update_non_existing_category(db: DBManager, fill_categories: list[CategoryDTO]) -> None:
     with pytest.raises(CategoryNotFoundError):
         category = CategoryUpdateDTO(title="123", description="123")
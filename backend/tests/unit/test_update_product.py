@@ -58,6 +58,21 @@ async def test_update_only_one_field(db: DBManager, fill_products_and_related_ca
     assert new.title != old.title and new.description != old.description
 
 
+async def test_update_product_in_single_statement(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+    executed_statements: list[str],
+) -> None:
+    old = fill_products_and_related_categories[0]
+    executed_statements.clear()
+    new = await ProductService(db).update_product(id=old.id, data=ProductUpdateDTO(price=old.price + 1))  # type: ignore
+
+    assert len(executed_statements) == 1
+    assert new.id == old.id
+    assert new.price == old.price + 1
+    assert new.title == old.title
+
+
 async def test_update_non_existing_product(db: DBManager) -> None:
     with pytest.raises(ProductNotFoundError):
         category = ProductUpdateDTO(
@@ -0,0 +1,27 @@
+import pytest
+
+from src.repos.base import MAX_QUERY_PARAMS
+from src.schemas.category import CategoryAddDTO
+from src.services.category import CategoryService
+from src.utils.db_tools import DBManager
+
+MANY = 40_000
+
+
+@pytest.mark.parametrize("update_fields", [None, ["description"]])
+async def test_upsert_reports_existing_beyond_bind_limit(
+    db: DBManager,
+    recreate_tables: None,
+    update_fields: list[str] | None,
+) -> None:
+    assert MANY > MAX_QUERY_PARAMS
+    data = [CategoryAddDTO(title=f"category {i}", description="same") for i in range(MANY)]
+    inserted = await CategoryService(db).upsert_categories(data)
+    await db.commit()
+    assert all(flag for flag, _ in inserted)
+
+    # every row conflicts and none changes, so all of them come back through the follow-up lookup
+    result = await CategoryService(db).upsert_categories(data, update_fields=update_fields)
+    assert len(result) == MANY
+    assert not any(flag for flag, _ in result)
+    assert [category.id for _, category in result] == [category.id for _, category in inserted]
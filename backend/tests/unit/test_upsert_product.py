@@ -0,0 +1,100 @@
+import pytest
+
+from src.schemas.product import ProductAddDTO, ProductDTO
+from src.services.product import ProductService
+from src.utils.db_tools import DBManager
+from src.utils.exceptions import CategoryNotFoundError, ProductInvalidValueError
+
+
+async def test_upsert_inserts_new_products(
+    db: DBManager,
+    product_examples: list[ProductAddDTO],
+    recreate_tables: None,
+    fill_categories: None,
+) -> None:
+    result = await ProductService(db).upsert_products(data=product_examples)
+    assert len(result) == len(product_examples)
+    assert all(inserted for inserted, _ in result)
+    assert [item.title for _, item in result] == [item.title for item in product_examples]
+
+
+async def test_upsert_do_nothing_reports_existing(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    existing = fill_products_and_related_categories[0]
+    new = ProductAddDTO(title="brand new", description=None, price=1.0, quantity=1, category_id=existing.category_id)
+    changed = ProductAddDTO(**existing.model_dump(exclude={"price"}), price=existing.price + 1)
+
+    result = await ProductService(db).upsert_products(data=[changed, new])
+    assert [inserted for inserted, _ in result] == [False, True]
+    assert result[0][1].id == existing.id
+    assert result[0][1].price == existing.price
+
+
+async def test_upsert_updates_selected_columns(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    existing = fill_products_and_related_categories[0]
+    changed = ProductAddDTO(**existing.model_dump(exclude={"price", "quantity"}), price=existing.price + 1, quantity=42)
+    unchanged = ProductAddDTO(**fill_products_and_related_categories[1].model_dump())
+
+    result = await ProductService(db).upsert_products(data=[changed, unchanged], update_fields=["price"])
+    assert [inserted for inserted, _ in result] == [False, False]
+    updated = result[0][1]
+    assert updated.id == existing.id
+    assert updated.price == existing.price + 1
+    assert updated.quantity == existing.quantity
+    assert updated.updated_at > existing.updated_at
+    assert result[1][1] == fill_products_and_related_categories[1]
+
+
+async def test_upsert_duplicates_in_one_batch(
+    db: DBManager,
+    fill_products_and_related_categories: list[ProductDTO],
+) -> None:
+    category_id = fill_products_and_related_categories[0].category_id
+    first = ProductAddDTO(title="twice", description=None, price=1.0, quantity=1, category_id=category_id)
+    second = ProductAddDTO(title="twice", description=None, price=2.0, quantity=1, category_id=category_id)
+
+    result = await ProductService(db).upsert_products(data=[first, second], update_fields=["price"])
+    assert len(result) == 2
+    assert result[0][1].id == result[1][1].id
+    assert result[1][1].price == 2.0
+
+
+async def test_upsert_with_non_existing_category(db: DBManager, clear_categories: None) -> None:
+    with pytest.raises(CategoryNotFoundError):
+        await ProductService(db).upsert_products(
+            data=[ProductAddDTO(title="123", description="a", quantity=1, category_id=1, price=3.0)]
+        )
+
+
+@pytest.mark.parametrize("update_fields", [["cost"], ["price", "search_vector"]])
+async def test_upsert_rejects_unknown_update_fields(
+    db: DBManager,
+    product_examples: list[ProductAddDTO],
+    update_fields: list[str],
+) -> None:
+    with pytest.raises(ProductInvalidValueError):
+        await ProductService(db).upsert_products(data=product_examples[:1], update_fields=update_fields)
+
+
+async def test_upsert_tracks_each_chunk_once(
+    db: DBManager,
+    product_examples: list[ProductAddDTO],
+    recreate_tables: None,
+    fill_categories: None,
+) -> None:
+    tracked: list[set[int]] = []
+    track_write = db.product._track_write
+
+    def record(ids=None) -> None:
+        tracked.append(set(ids))
+        track_write(tracked[-1])
+
+    db.product._track_write = record  # type: ignore
+    result = await db.product.upsert_bulk(product_examples, chunk_size=5)
+    assert sum(map(len, tracked)) == len(result)
+    assert set().union(*tracked) == {item.id for _, item in result}